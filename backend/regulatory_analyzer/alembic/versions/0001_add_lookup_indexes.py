@@ -0,0 +1,39 @@
+"""add lookup indexes for foreign keys and schedule due scan
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_reports_user_id", "reports", ["user_id"]),
+    ("ix_reports_company_profile_id", "reports", ["company_profile_id"]),
+    ("ix_regulatory_changes_report_id", "regulatory_changes", ["report_id"]),
+    ("ix_schedules_user_id", "schedules", ["user_id"]),
+    ("ix_schedules_company_profile_id", "schedules", ["company_profile_id"]),
+    ("ix_schedules_next_run", "schedules", ["next_run"]),
+    ("ix_schedule_due", "schedules", ["is_active", "next_run"]),
+)
+
+
+def upgrade() -> None:
+    # Tables may already carry these from Base.metadata.create_all
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,72 @@
+"""store low-cardinality string columns as native enums
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type, values, previous VARCHAR length)
+ENUM_COLUMNS = (
+    ("company_profiles", "company_size", "company_size", ("small", "medium", "large"), 50),
+    ("reports", "status", "report_status", ("pending", "in_progress", "completed", "failed"), 50),
+    ("regulatory_changes", "risk_level", "risk_level", ("low", "medium", "high", "critical"), 20),
+    ("trusted_sources", "source_type", "source_type", ("government", "regulatory_body", "news", "industry", "legal"), 100),
+    ("schedules", "frequency", "schedule_frequency", ("daily", "weekly", "monthly", "quarterly"), 50),
+)
+
+# Existing values are free text (database_setup.sql seeds company_size 'Large'),
+# so they are lowercased and trimmed before the cast. Anything still outside the
+# enum becomes the column's fallback here, or NULL if it has none.
+FALLBACK_VALUES = {("reports", "status"): "pending"}
+
+
+def normalize_values_sql(table: str, column: str, values: Sequence[str]) -> str:
+    """UPDATE replacing values that will not cast to the enum with the fallback"""
+    fallback = FALLBACK_VALUES.get((table, column))
+    replacement = f"'{fallback}'" if fallback else "NULL"
+    allowed = ", ".join(f"'{value}'" for value in values)
+    return (
+        f"UPDATE {table} SET {column} = {replacement} "
+        f"WHERE lower(trim({column})) NOT IN ({allowed})"
+    )
+
+
+def upgrade() -> None:
+    for table, column, type_name, values, _ in ENUM_COLUMNS:
+        postgresql.ENUM(*values, name=type_name).create(op.get_bind(), checkfirst=True)
+        # The default has to be dropped while the column type changes
+        if (table, column) == ("reports", "status"):
+            op.execute("ALTER TABLE reports ALTER COLUMN status DROP DEFAULT")
+        op.execute(normalize_values_sql(table, column, values))
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {type_name} USING lower(trim({column}))::{type_name}"
+        )
+    op.execute("ALTER TABLE reports ALTER COLUMN status SET DEFAULT 'pending'")
+    op.create_index("ix_reports_status", "reports", ["status"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_status", table_name="reports", if_exists=True)
+    op.execute("ALTER TABLE reports ALTER COLUMN status DROP DEFAULT")
+    for table, column, type_name, _, length in reversed(ENUM_COLUMNS):
+        op.alter_column(
+            table, column,
+            type_=sa.String(length),
+            postgresql_using=f"{column}::text"
+        )
+        postgresql.ENUM(name=type_name).drop(op.get_bind(), checkfirst=True)
+    op.execute("ALTER TABLE reports ALTER COLUMN status SET DEFAULT 'pending'")
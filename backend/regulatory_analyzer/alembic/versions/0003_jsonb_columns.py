@@ -0,0 +1,54 @@
+"""store list columns as jsonb with gin indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = (
+    ("company_profiles", "keywords"),
+    ("company_profiles", "trusted_sources"),
+    ("regulatory_changes", "relevant_sections"),
+    ("regulatory_changes", "affected_areas"),
+    ("regulatory_changes", "action_items"),
+)
+
+GIN_INDEXES = (
+    ("ix_cp_keywords", "company_profiles", "keywords"),
+    ("ix_rc_affected_areas", "regulatory_changes", "affected_areas"),
+)
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f"{column}::jsonb"
+        )
+    for name, table, column in GIN_INDEXES:
+        op.create_index(name, table, [column], postgresql_using="gin", if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in GIN_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f"{column}::json"
+        )
@@ -2,10 +2,11 @@
 Regulatory Intelligence Platform - Main FastAPI Application
 """
 
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 import uvicorn
+from prometheus_client import CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 import logging
 
@@ -15,7 +16,7 @@ from src.database.models import Base
 from src.core.pipeline.orchestrator import AnalysisOrchestrator
 from src.socketio_server import socket_app, sio
 from src.config import DEBUG, HOST, PORT
-from src.monitoring import metrics_collector, setup_logging
+from src.monitoring import MetricsMiddleware, metrics_collector, setup_logging
 
 # Configure logging
 setup_logging("INFO" if not DEBUG else "DEBUG")
@@ -50,6 +51,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
@@ -70,10 +74,10 @@ async def health_check():
 @app.get("/metrics")
 async def get_metrics():
     """Prometheus metrics endpoint"""
-    from fastapi import Response
     return Response(
-        content=metrics_collector.get_metrics(),
-        media_type="text/plain"
+        content=await metrics_collector.get_metrics_async(),
+        # Passed as a header, since media_type would append a second charset
+        headers={"Content-Type": CONTENT_TYPE_LATEST}
     )
 
 # Mount Socket.io app
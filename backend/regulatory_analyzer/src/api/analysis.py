@@ -113,7 +113,7 @@ async def get_active_analyses(db: Session = Depends(get_db)):
         "analyses": [report.id for report in active_reports]
     }
 
-@router.get("/reports", response_model=List[ReportResponse])
+@router.get("/reports", response_model=None)
 async def get_reports(
     skip: int = 0,
     limit: int = 20,
@@ -121,15 +121,15 @@ async def get_reports(
 ):
     """Get all reports with pagination"""
     reports = db.query(Report).offset(skip).limit(limit).all()
-    return reports
+    return [ReportResponse.from_orm_fast(report) for report in reports]
 
-@router.get("/reports/{report_id}", response_model=ReportResponse)
+@router.get("/reports/{report_id}", response_model=None)
 async def get_report(report_id: int, db: Session = Depends(get_db)):
     """Get a specific report by ID"""
     report = db.query(Report).filter(Report.id == report_id).first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
-    return report
+    return ReportResponse.from_orm_fast(report)
 
 @router.delete("/reports/{report_id}")
 async def delete_report(report_id: int, db: Session = Depends(get_db)):
@@ -11,7 +11,7 @@ from passlib.context import CryptContext
 
 from ..database.session import get_db
 from ..database.models import User as UserModel
-from ..schemas import UserCreate, User, LoginRequest, Token, TokenData
+from ..schemas import UserCreate, User, LoginRequest, Token, TokenData, MsgspecJSONResponse, msgspec_body
 from ..config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter()
@@ -108,8 +108,11 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
-@router.post("/login", response_model=Token)
-async def login_user(login_data: LoginRequest, db: Session = Depends(get_db)):
+@router.post("/login", response_model=None)
+async def login_user(
+    login_data: LoginRequest = Depends(msgspec_body(LoginRequest)),
+    db: Session = Depends(get_db)
+):
     """Login user and return access token"""
     user = authenticate_user(db, login_data.username, login_data.password)
     if not user:
@@ -123,12 +126,12 @@ async def login_user(login_data: LoginRequest, db: Session = Depends(get_db)):
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return MsgspecJSONResponse(Token(access_token=access_token, token_type="bearer"))
 
-@router.get("/me", response_model=User)
+@router.get("/me", response_model=None)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return current_user
+    return User.from_orm_fast(current_user)
 
 @router.put("/me", response_model=User)
 async def update_current_user(
@@ -3,13 +3,17 @@ Box API endpoints for document storage and management
 """
 
 import logging
+import os
+import unicodedata
 from typing import List, Optional
+from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from ..database.session import get_db
 from ..database.models import User, BoxDocument, BoxFolder, CompanyProfile
 from ..api.auth import get_current_user
-from ..services.box_service import box_service
+from ..services.box_service import BoxService, get_box_service
 from ..schemas import BoxDocumentResponse, BoxFolderResponse, BoxUploadResponse
 from pydantic import BaseModel
 
@@ -17,6 +21,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/box", tags=["box"])
 
+def _ascii_filename_part(value: str) -> str:
+    """Closest printable ASCII for a filename part, without quotes or backslashes"""
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return "".join(c for c in value if c.isprintable() and c not in '"\\')
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header with an ASCII fallback plus the RFC 5987 UTF-8 name"""
+    stem, ext = os.path.splitext(filename)
+    fallback = f"{_ascii_filename_part(stem).strip() or 'download'}{_ascii_filename_part(ext)}"
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename, safe="")}'
+
 class BoxFolderCreate(BaseModel):
     name: str
     parent_folder_id: Optional[str] = None
@@ -30,7 +45,10 @@ class BoxSharedLinkCreate(BaseModel):
     expires_at: Optional[str] = None
 
 @router.get("/status")
-async def get_box_status(current_user: User = Depends(get_current_user)):
+async def get_box_status(
+    current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service)
+):
     """Check Box API connection status"""
     return {
         "available": box_service.is_available(),
@@ -41,6 +59,7 @@ async def get_box_status(current_user: User = Depends(get_current_user)):
 async def create_folder(
     folder_data: BoxFolderCreate,
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Create a new folder in Box"""
@@ -86,7 +105,7 @@ async def create_folder(
         logger.error(f"Error creating Box folder: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create folder: {str(e)}")
 
-@router.get("/folders", response_model=List[BoxFolderResponse])
+@router.get("/folders", response_model=None)
 async def list_folders(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -97,17 +116,7 @@ async def list_folders(
         BoxFolder.is_active == True
     ).all()
     
-    return [
-        BoxFolderResponse(
-            id=folder.id,
-            box_folder_id=folder.box_folder_id,
-            folder_name=folder.folder_name,
-            folder_type=folder.folder_type,
-            description=folder.description,
-            created_at=folder.created_at
-        )
-        for folder in folders
-    ]
+    return [BoxFolderResponse.from_orm_fast(folder) for folder in folders]
 
 @router.post("/upload", response_model=BoxUploadResponse)
 async def upload_file(
@@ -117,6 +126,7 @@ async def upload_file(
     document_category: Optional[str] = Form("regulatory_document"),
     report_id: Optional[int] = Form(None),
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Upload a file to Box"""
@@ -175,7 +185,7 @@ async def upload_file(
         logger.error(f"Error uploading file to Box: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
-@router.get("/documents", response_model=List[BoxDocumentResponse])
+@router.get("/documents", response_model=None)
 async def list_documents(
     report_id: Optional[int] = Query(None),
     document_category: Optional[str] = Query(None),
@@ -193,23 +203,9 @@ async def list_documents(
     
     documents = query.all()
     
-    return [
-        BoxDocumentResponse(
-            id=doc.id,
-            box_file_id=doc.box_file_id,
-            filename=doc.filename,
-            file_type=doc.file_type,
-            file_size=doc.file_size,
-            description=doc.description,
-            shared_link=doc.shared_link,
-            download_url=doc.download_url,
-            document_category=doc.document_category,
-            created_at=doc.created_at
-        )
-        for doc in documents
-    ]
+    return [BoxDocumentResponse.from_orm_fast(doc) for doc in documents]
 
-@router.get("/documents/{document_id}", response_model=BoxDocumentResponse)
+@router.get("/documents/{document_id}", response_model=None)
 async def get_document(
     document_id: int,
     current_user: User = Depends(get_current_user),
@@ -224,23 +220,13 @@ async def get_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    return BoxDocumentResponse(
-        id=document.id,
-        box_file_id=document.box_file_id,
-        filename=document.filename,
-        file_type=document.file_type,
-        file_size=document.file_size,
-        description=document.description,
-        shared_link=document.shared_link,
-        download_url=document.download_url,
-        document_category=document.document_category,
-        created_at=document.created_at
-    )
+    return BoxDocumentResponse.from_orm_fast(document)
 
 @router.get("/documents/{document_id}/download")
 async def download_document(
     document_id: int,
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Download a document from Box"""
@@ -261,11 +247,11 @@ async def download_document(
         if not file_content:
             raise HTTPException(status_code=500, detail="Failed to download file from Box")
         
-        return {
-            "filename": document.filename,
-            "content": file_content,
-            "content_type": document.file_type
-        }
+        return StreamingResponse(
+            file_content,
+            media_type=document.file_type or "application/octet-stream",
+            headers={"Content-Disposition": _content_disposition(document.filename)}
+        )
         
     except Exception as e:
         logger.error(f"Error downloading document: {e}")
@@ -276,6 +262,7 @@ async def create_shared_link(
     document_id: int,
     link_data: BoxSharedLinkCreate,
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Create a shared link for a document"""
@@ -317,6 +304,7 @@ async def create_shared_link(
 async def delete_document(
     document_id: int,
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Delete a document from Box and database"""
@@ -354,6 +342,7 @@ async def delete_document(
 async def setup_company_folders(
     company_profile_id: int,
     current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service),
     db: Session = Depends(get_db)
 ):
     """Set up Box folder structure for a company profile"""
@@ -405,7 +394,8 @@ async def setup_company_folders(
 async def search_documents(
     query: str = Query(..., description="Search query"),
     limit: int = Query(100, description="Maximum number of results"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    box_service: BoxService = Depends(get_box_service)
 ):
     """Search for documents in Box"""
     if not box_service.is_available():
@@ -8,7 +8,7 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 
 from ..database.session import get_db
-from ..database.models import User, Report, RegulatoryChange
+from ..database.models import User, Report, RegulatoryChange, ReportStatus, RiskLevel
 from ..schemas import Report, RegulatoryChange
 from ..api.auth import get_current_user
 
@@ -19,7 +19,7 @@ async def get_analysis_history(
     skip: int = 0,
     limit: int = 100,
     days: Optional[int] = None,
-    status: Optional[str] = None,
+    status: Optional[ReportStatus] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -43,7 +43,7 @@ async def get_regulatory_changes_history(
     skip: int = 0,
     limit: int = 100,
     days: Optional[int] = None,
-    risk_level: Optional[str] = None,
+    risk_level: Optional[RiskLevel] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
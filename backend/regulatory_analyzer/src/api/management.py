@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ..database.session import get_db
-from ..database.models import User, CompanyProfile, TrustedSource, Report
+from ..database.models import User, CompanyProfile, TrustedSource, Report, SourceType
 from ..schemas import (
     CompanyProfileCreate, CompanyProfile, CompanyProfileUpdate,
     TrustedSourceCreate, TrustedSource, TrustedSourceUpdate
@@ -144,7 +144,7 @@ async def create_trusted_source(
 async def get_trusted_sources(
     skip: int = 0,
     limit: int = 100,
-    source_type: Optional[str] = None,
+    source_type: Optional[SourceType] = None,
     jurisdiction: Optional[str] = None,
     is_active: Optional[bool] = None,
     db: Session = Depends(get_db)
@@ -10,7 +10,7 @@ from ..database.session import get_db
 from ..database.models import User, Report, CompanyProfile, RegulatoryChange
 from ..schemas import (
     ReportCreate, Report, ReportUpdate, 
-    RegulatoryChange, AnalysisRequest, AnalysisResult
+    RegulatoryChange, AnalysisRequest, AnalysisResult, msgspec_body
 )
 from ..api.auth import get_current_user
 from ..core.pipeline.orchestrator import AnalysisOrchestrator
@@ -156,8 +156,8 @@ async def get_report_regulatory_changes(
 
 @router.post("/analyze", response_model=Report)
 async def start_analysis(
-    analysis_request: AnalysisRequest,
     background_tasks: BackgroundTasks,
+    analysis_request: AnalysisRequest = Depends(msgspec_body(AnalysisRequest)),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
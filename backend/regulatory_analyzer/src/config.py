@@ -25,6 +25,14 @@ BOX_ACCESS_TOKEN = os.getenv("BOX_ACCESS_TOKEN", "")
 BOX_REFRESH_TOKEN = os.getenv("BOX_REFRESH_TOKEN", "")
 BOX_ENTERPRISE_ID = os.getenv("BOX_ENTERPRISE_ID", "")
 BOX_FOLDER_ID = os.getenv("BOX_FOLDER_ID", "0")  # Root folder by default
+# Path to the JWT app settings JSON from the Box Developer Console; when set it
+# is used instead of the OAuth2 user tokens above
+BOX_JWT_CONFIG_FILE = os.getenv("BOX_JWT_CONFIG_FILE", "")
+# Verify the Box credentials with a users/me call when the client is created
+BOX_STARTUP_PROBE = os.getenv("BOX_STARTUP_PROBE", "False").lower() == "true"
+
+# Redis Configuration
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 
 # Application Configuration
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
@@ -36,10 +44,14 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
 # Socket.io Configuration
 SOCKET_IO_CORS_ALLOWED_ORIGINS = [FRONTEND_URL]
+# Log every Socket.io/Engine.IO frame; off by default since it formats a record per emit
+SIO_DEBUG = os.getenv("SIO_DEBUG", "False").lower() == "true"
 
 # Analysis Pipeline Configuration
 MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "5"))
 ANALYSIS_TIMEOUT_MINUTES = int(os.getenv("ANALYSIS_TIMEOUT_MINUTES", "60"))
+# Deduplicate content across reports using MinHash signatures stored in Redis
+CROSS_REPORT_DEDUP = os.getenv("CROSS_REPORT_DEDUP", "False").lower() == "true"
 
 # File Upload Configuration
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
@@ -3,183 +3,293 @@ Content Filter - Stage 3 of the AI analysis pipeline
 Filters and ranks acquired data based on relevance and quality
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Any
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Set, FrozenSet
+from urllib.parse import urlparse
+from datasketch import MinHash, MinHashLSH
 from ...database.models import CompanyProfile
+from ...config import REDIS_URL, CROSS_REPORT_DEDUP
 
 logger = logging.getLogger(__name__)
 
+# Keyword tables used for relevance scoring, keyed by a substring of the
+# profile's industry / jurisdiction
+INDUSTRY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "technology": ("software", "digital", "cybersecurity", "data", "AI", "automation"),
+    "energy": ("energy", "power", "renewable", "solar", "wind", "fossil", "nuclear"),
+    "healthcare": ("medical", "health", "pharmaceutical", "clinical", "patient", "drug"),
+    "financial": ("banking", "finance", "investment", "insurance", "credit", "payment"),
+    "manufacturing": ("production", "factory", "equipment", "machinery", "assembly"),
+    "retail": ("consumer", "retail", "commerce", "shopping", "customer", "sales")
+}
+
+JURISDICTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "us": ("united states", "usa", "federal", "state", "american"),
+    "uk": ("united kingdom", "britain", "england", "scotland", "wales"),
+    "eu": ("european union", "europe", "eu", "european"),
+    "canada": ("canada", "canadian", "provincial"),
+    "australia": ("australia", "australian", "state", "territory")
+}
+
+# Relevance contributed by each source type
+SOURCE_RELEVANCE_SCORES: Dict[str, float] = {
+    "government": 0.3,
+    "regulatory_body": 0.25,
+    "legal": 0.2,
+    "industry": 0.15,
+    "news": 0.1
+}
+
+# Quality filter criteria
+BAD_SOURCE_TYPES = frozenset({"spam", "low_quality"})
+REQUIRED_FIELDS = ("title", "content", "source")
+
+def _match_keywords(table: Dict[str, Tuple[str, ...]], value: str) -> Tuple[str, ...]:
+    """Return the keywords of the first table entry whose key occurs in value"""
+    value_lower = value.lower()
+    for key, keywords in table.items():
+        if key in value_lower:
+            return keywords
+    return ()
+
+@lru_cache(maxsize=128)
+def _lookup_industry_keywords(industry: str) -> Tuple[str, ...]:
+    """Get keywords related to an industry"""
+    return _match_keywords(INDUSTRY_KEYWORDS, industry)
+
+@lru_cache(maxsize=128)
+def _lookup_jurisdiction_keywords(jurisdiction: str) -> Tuple[str, ...]:
+    """Get keywords related to a jurisdiction"""
+    return _match_keywords(JURISDICTION_KEYWORDS, jurisdiction)
+
+@lru_cache(maxsize=128)
+def _encode_keywords(keywords: Tuple[str, ...]) -> Tuple[bytes, ...]:
+    """Encode ASCII keywords for matching against lowercased content bytes"""
+    return tuple(keyword.encode("ascii") for keyword in keywords if keyword.isascii())
+
+def _content_bytes(item: Dict[str, Any], cache: Dict[int, bytes]) -> bytes:
+    """Lowercased UTF-8 content of an item, cached by item id
+
+    bytes.lower() only folds ASCII letters, so this buffer is only searched
+    with ASCII keywords; non-ASCII keywords fall back to str matching. The
+    cache lives beside the items, not on them, so it never reaches later
+    pipeline stages.
+    """
+    content_lb = cache.get(id(item))
+    if content_lb is None:
+        content_lb = item.get("content", "").encode("utf-8", "ignore").lower()
+        cache[id(item)] = content_lb
+    return content_lb
+
+def _title_words(item: Dict[str, Any]) -> FrozenSet[str]:
+    """Lowercased title words of an item"""
+    return frozenset(item.get("title", "").lower().split())
+
+class DuplicateTracker:
+    """Remembers kept content so duplicates are also caught across batches"""
+    
+    def __init__(self):
+        self.seen_urls: Set[str] = set()
+        self.seen_content_hashes: Set[bytes] = set()
+        # Maps each title word to the kept titles containing it, so similarity
+        # is only checked against titles that share at least one word
+        self.title_index: Dict[str, Set[FrozenSet[str]]] = defaultdict(set)
+
 class ContentFilter:
     """Filters and ranks regulatory content based on relevance and quality"""
     
+    LSH_THRESHOLD = 0.8
+    LSH_NUM_PERM = 64
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._initialize_lsh()
+    
+    def _initialize_lsh(self):
+        """Initialize the Redis-backed MinHash LSH shared across reports"""
+        self.lsh = None
+        if not CROSS_REPORT_DEDUP:
+            return
+        
+        try:
+            redis_url = urlparse(REDIS_URL)
+            self.lsh = MinHashLSH(
+                threshold=self.LSH_THRESHOLD,
+                num_perm=self.LSH_NUM_PERM,
+                storage_config={
+                    "type": "redis",
+                    "basename": b"regulatory_content_lsh",
+                    "redis": {
+                        "host": redis_url.hostname or "localhost",
+                        "port": redis_url.port or 6379
+                    }
+                }
+            )
+            self.logger.info("Cross-report deduplication enabled")
+        except Exception as e:
+            self.logger.error(f"Failed to initialize cross-report deduplication: {e}")
+            self.lsh = None
     
     async def filter_content(
         self,
         raw_data: List[Dict[str, Any]],
         company_profile: CompanyProfile,
-        analysis_type: str = "comprehensive"
+        analysis_type: str = "comprehensive",
+        duplicate_tracker: Optional[DuplicateTracker] = None
     ) -> List[Dict[str, Any]]:
-        """Filter and rank content based on relevance and quality"""
+        """Filter and rank content based on relevance and quality
+        
+        Pass the same duplicate_tracker when filtering a stream of batches so
+        duplicates of items kept from earlier batches are dropped too.
+        """
         
         self.logger.info(f"Filtering {len(raw_data)} data items")
         
         # Apply quality filters
-        quality_filtered = await self._apply_quality_filters(raw_data)
+        quality_filtered = self._apply_quality_filters(raw_data)
+        
+        # Lowercased content shared by relevance scoring and dedup, keyed by
+        # id(item); raw_data keeps every item alive until this returns
+        content_cache: Dict[int, bytes] = {}
         
         # Apply relevance filters
-        relevance_filtered = await self._apply_relevance_filters(quality_filtered, company_profile)
+        scorer = self._compile_scorer(company_profile, content_cache)
+        relevance_filtered = self._apply_relevance_filters(quality_filtered, scorer)
         
         # Rank content by importance
         ranked_content = await self._rank_content(relevance_filtered, company_profile, analysis_type)
         
         # Remove duplicates
-        deduplicated = await self._remove_duplicates(ranked_content)
+        deduplicated = await self._remove_duplicates(ranked_content, duplicate_tracker, content_cache)
         
         self.logger.info(f"Filtered to {len(deduplicated)} relevant items")
         return deduplicated
     
-    async def _apply_quality_filters(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Apply quality filters to remove low-quality content"""
+    def _apply_quality_filters(self, data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Apply quality filters to remove low-quality content
         
-        filtered_data = []
+        Checks run cheapest first so obvious rejects are dropped early.
+        """
         
         for item in data:
-            # Check if item has required fields
-            if not all(key in item for key in ["title", "content", "source"]):
+            # Check source type quality
+            if item.get("source_type", "") in BAD_SOURCE_TYPES:
                 continue
             
-            # Check content length
-            if len(item.get("content", "")) < 50:
+            # Check if item has required fields
+            if not all(key in item for key in REQUIRED_FIELDS):
                 continue
             
             # Check relevance score
-            relevance_score = item.get("relevance_score", 0)
-            if relevance_score < 0.3:
+            if item.get("relevance_score", 0) < 0.3:
                 continue
             
-            # Check source type quality
-            source_type = item.get("source_type", "")
-            if source_type in ["spam", "low_quality"]:
+            # Check content length
+            if len(item.get("content", "")) < 50:
                 continue
             
-            filtered_data.append(item)
-        
-        return filtered_data
+            yield item
     
-    async def _apply_relevance_filters(
+    def _apply_relevance_filters(
         self,
-        data: List[Dict[str, Any]],
-        company_profile: CompanyProfile
-    ) -> List[Dict[str, Any]]:
-        """Apply relevance filters based on company profile"""
-        
-        filtered_data = []
+        data: Iterable[Dict[str, Any]],
+        scorer: Callable[[Dict[str, Any]], float]
+    ) -> Iterator[Dict[str, Any]]:
+        """Apply relevance filters using a scorer built for the company profile"""
         
         for item in data:
-            relevance_score = self._calculate_relevance_score(item, company_profile)
+            relevance_score = scorer(item)
             item["relevance_score"] = relevance_score
             
             # Only include items with sufficient relevance
             if relevance_score >= 0.5:
-                filtered_data.append(item)
-        
-        return filtered_data
+                yield item
     
-    def _calculate_relevance_score(
+    def _compile_scorer(
         self,
-        item: Dict[str, Any],
-        company_profile: CompanyProfile
-    ) -> float:
-        """Calculate relevance score for an item based on company profile"""
-        
-        score = 0.0
-        
-        # Base score from source
-        base_score = item.get("relevance_score", 0.5)
-        score += base_score * 0.3
-        
-        # Industry relevance
-        if company_profile.industry:
-            industry_keywords = self._get_industry_keywords(company_profile.industry)
-            if any(keyword in item.get("content", "").lower() for keyword in industry_keywords):
-                score += 0.2
-        
-        # Jurisdiction relevance
-        if company_profile.jurisdiction:
-            jurisdiction_keywords = self._get_jurisdiction_keywords(company_profile.jurisdiction)
-            if any(keyword in item.get("content", "").lower() for keyword in jurisdiction_keywords):
-                score += 0.2
-        
-        # Company keywords relevance
-        if company_profile.keywords:
-            for keyword in company_profile.keywords:
-                if keyword.lower() in item.get("content", "").lower():
+        company_profile: CompanyProfile,
+        content_cache: Optional[Dict[int, bytes]] = None
+    ) -> Callable[[Dict[str, Any]], float]:
+        """Build a relevance scorer specialised for one company profile
+        
+        Keyword lists are resolved and encoded once, and checks for profile
+        fields that are not set are left out of the returned function.
+        """
+        
+        # Industry and jurisdiction relevance: any matching keyword adds the weight
+        keyword_checks = tuple(
+            (keywords, weight)
+            for keywords, weight in (
+                (_encode_keywords(self._get_industry_keywords(company_profile.industry or "")), 0.2),
+                (_encode_keywords(self._get_jurisdiction_keywords(company_profile.jurisdiction or "")), 0.2)
+            )
+            if keywords
+        )
+        
+        # Company keywords relevance: every matching keyword adds 0.1
+        company_keywords = tuple(keyword.lower() for keyword in company_profile.keywords or ())
+        company_text_keywords = tuple(
+            keyword for keyword in company_keywords if not keyword.isascii()
+        )
+        company_keywords = _encode_keywords(company_keywords)
+        
+        source_score = SOURCE_RELEVANCE_SCORES.get
+        if content_cache is None:
+            content_cache = {}
+        
+        def score_item(item: Dict[str, Any]) -> float:
+            content_lb = _content_bytes(item, content_cache)
+            
+            # Base score from source
+            score = item.get("relevance_score", 0.5) * 0.3
+            
+            for keywords, weight in keyword_checks:
+                if any(keyword in content_lb for keyword in keywords):
+                    score += weight
+            
+            for keyword in company_keywords:
+                if keyword in content_lb:
                     score += 0.1
+            
+            if company_text_keywords:
+                content_lower = item.get("content", "").lower()
+                for keyword in company_text_keywords:
+                    if keyword in content_lower:
+                        score += 0.1
+            
+            # Source type relevance
+            score += source_score(item.get("source_type", ""), 0.05)
+            
+            # Ensure score is between 0 and 1
+            return min(max(score, 0.0), 1.0)
         
-        # Source type relevance
-        source_type = item.get("source_type", "")
-        source_scores = {
-            "government": 0.3,
-            "regulatory_body": 0.25,
-            "legal": 0.2,
-            "industry": 0.15,
-            "news": 0.1
-        }
-        score += source_scores.get(source_type, 0.05)
-        
-        # Ensure score is between 0 and 1
-        return min(max(score, 0.0), 1.0)
+        return score_item
     
-    def _get_industry_keywords(self, industry: str) -> List[str]:
+    def _get_industry_keywords(self, industry: str) -> Tuple[str, ...]:
         """Get keywords related to an industry"""
-        
-        industry_keywords = {
-            "technology": ["software", "digital", "cybersecurity", "data", "AI", "automation"],
-            "energy": ["energy", "power", "renewable", "solar", "wind", "fossil", "nuclear"],
-            "healthcare": ["medical", "health", "pharmaceutical", "clinical", "patient", "drug"],
-            "financial": ["banking", "finance", "investment", "insurance", "credit", "payment"],
-            "manufacturing": ["production", "factory", "equipment", "machinery", "assembly"],
-            "retail": ["consumer", "retail", "commerce", "shopping", "customer", "sales"]
-        }
-        
-        industry_lower = industry.lower()
-        for key, keywords in industry_keywords.items():
-            if key in industry_lower:
-                return keywords
-        
-        return []
+        return _lookup_industry_keywords(industry)
     
-    def _get_jurisdiction_keywords(self, jurisdiction: str) -> List[str]:
+    def _get_jurisdiction_keywords(self, jurisdiction: str) -> Tuple[str, ...]:
         """Get keywords related to a jurisdiction"""
-        
-        jurisdiction_keywords = {
-            "us": ["united states", "usa", "federal", "state", "american"],
-            "uk": ["united kingdom", "britain", "england", "scotland", "wales"],
-            "eu": ["european union", "europe", "eu", "european"],
-            "canada": ["canada", "canadian", "provincial"],
-            "australia": ["australia", "australian", "state", "territory"]
-        }
-        
-        jurisdiction_lower = jurisdiction.lower()
-        for key, keywords in jurisdiction_keywords.items():
-            if key in jurisdiction_lower:
-                return keywords
-        
-        return []
+        return _lookup_jurisdiction_keywords(jurisdiction)
     
     async def _rank_content(
         self,
-        data: List[Dict[str, Any]],
+        data: Iterable[Dict[str, Any]],
         company_profile: CompanyProfile,
         analysis_type: str
     ) -> List[Dict[str, Any]]:
         """Rank content by importance and relevance"""
         
+        ranked = []
+        
         for item in data:
             importance_score = self._calculate_importance_score(item, company_profile, analysis_type)
             item["importance_score"] = importance_score
+            ranked.append(item)
         
         # Sort by combined score (relevance + importance)
         def sort_key(item):
@@ -187,7 +297,8 @@ class ContentFilter:
             importance = item.get("importance_score", 0)
             return (relevance + importance) / 2
         
-        return sorted(data, key=sort_key, reverse=True)
+        ranked.sort(key=sort_key, reverse=True)
+        return ranked
     
     def _calculate_importance_score(
         self,
@@ -234,35 +345,82 @@ class ContentFilter:
         
         return min(max(score, 0.0), 1.0)
     
-    async def _remove_duplicates(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate content based on URL and title similarity"""
-        
-        seen_urls = set()
-        seen_titles = set()
+    async def _remove_duplicates(
+        self,
+        data: List[Dict[str, Any]],
+        duplicate_tracker: Optional[DuplicateTracker] = None,
+        content_cache: Optional[Dict[int, bytes]] = None
+    ) -> List[Dict[str, Any]]:
+        """Remove duplicate content based on URL, content hash and title similarity"""
+        
+        tracker = duplicate_tracker or DuplicateTracker()
+        if content_cache is None:
+            content_cache = {}
+        seen_urls = tracker.seen_urls
+        seen_content_hashes = tracker.seen_content_hashes
+        title_index = tracker.title_index
         deduplicated = []
         
         for item in data:
             url = item.get("url", "")
-            title = item.get("title", "").lower()
             
             # Check for exact URL duplicates
             if url in seen_urls:
                 continue
             
+            # Check for exact content duplicates
+            content_lb = _content_bytes(item, content_cache)
+            content_hash = hashlib.blake2b(content_lb, digest_size=16).digest()
+            if content_hash in seen_content_hashes:
+                continue
+            
             # Check for title similarity
-            title_words = set(title.split())
+            title_words = _title_words(item)
+            candidates = set()
+            for word in title_words:
+                candidates.update(title_index.get(word, ()))
+            
             is_duplicate = False
             
-            for seen_title in seen_titles:
-                seen_words = set(seen_title.split())
+            title_len = len(title_words)
+            
+            for seen_words in candidates:
+                # Jaccard similarity is at most min/max of the set sizes, so
+                # titles whose lengths differ too much can never match
+                seen_len = len(seen_words)
+                if min(title_len, seen_len) <= 0.8 * max(title_len, seen_len):
+                    continue
+                
                 # If more than 80% of words match, consider it a duplicate
                 if len(title_words & seen_words) / len(title_words | seen_words) > 0.8:
                     is_duplicate = True
                     break
             
+            # Check for near-duplicates seen in previous reports
+            if not is_duplicate and self.lsh is not None:
+                is_duplicate = self._is_known_content(url, content_lb)
+            
             if not is_duplicate:
                 seen_urls.add(url)
-                seen_titles.add(title)
+                seen_content_hashes.add(content_hash)
+                for word in title_words:
+                    title_index[word].add(title_words)
                 deduplicated.append(item)
         
-        return deduplicated
\ No newline at end of file
+        return deduplicated
+    
+    def _is_known_content(self, url: str, content_lb: bytes) -> bool:
+        """Check the shared LSH for near-duplicate content, recording it on a miss"""
+        
+        minhash = MinHash(num_perm=self.LSH_NUM_PERM)
+        minhash.update_batch(set(content_lb.split()))
+        
+        try:
+            if self.lsh.query(minhash):
+                return True
+            if url not in self.lsh:
+                self.lsh.insert(url, minhash)
+        except Exception as e:
+            self.logger.error(f"Cross-report deduplication lookup failed: {e}")
+        
+        return False
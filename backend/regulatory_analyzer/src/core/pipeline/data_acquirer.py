@@ -5,59 +5,90 @@ Acquires regulatory data from various sources based on generated queries
 
 import logging
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 import httpx
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from .query_generator import Query
 
 logger = logging.getLogger(__name__)
 
 class DataAcquirer:
     """Acquires regulatory data from various sources"""
     
+    GOVERNMENT_SITES = (
+        "https://www.gov.uk/search?q=",
+        "https://www.usa.gov/search?query=",
+        "https://ec.europa.eu/search?query=",
+        "https://www.federalregister.gov/search?q="
+    )
+    
+    REGULATORY_BODIES = (
+        "SEC", "FDA", "EPA", "FTC", "FCC",  # US
+        "FCA", "MHRA", "HSE", "Ofcom",      # UK
+        "EMA", "EFSA", "EASA", "ACER"       # EU
+    )
+    
+    NEWS_SOURCES = (
+        "Reuters", "Bloomberg", "Financial Times", "Wall Street Journal"
+    )
+    
+    # Upper bound on queries searched at once within a priority group
+    MAX_CONCURRENT_QUERIES = 10
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.http_client = httpx.AsyncClient(timeout=30.0)
     
-    async def acquire_data(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def acquire_data(self, queries: List[Query]) -> List[Dict[str, Any]]:
         """Acquire data from various sources based on queries"""
         
         self.logger.info(f"Acquiring data for {len(queries)} queries")
         
         all_data = []
         
-        # Group queries by priority
-        high_priority_queries = [q for q in queries if q.get("priority") == "high"]
-        medium_priority_queries = [q for q in queries if q.get("priority") == "medium"]
-        low_priority_queries = [q for q in queries if q.get("priority") == "low"]
-        
-        # Process high priority queries first
-        if high_priority_queries:
-            high_priority_data = await self._process_queries_batch(high_priority_queries)
-            all_data.extend(high_priority_data)
-        
-        # Process medium priority queries
-        if medium_priority_queries:
-            medium_priority_data = await self._process_queries_batch(medium_priority_queries)
-            all_data.extend(medium_priority_data)
-        
-        # Process low priority queries
-        if low_priority_queries:
-            low_priority_data = await self._process_queries_batch(low_priority_queries)
-            all_data.extend(low_priority_data)
+        async for batch in self.acquire_data_batches(queries):
+            all_data.extend(batch)
         
         self.logger.info(f"Acquired {len(all_data)} data items")
         return all_data
     
-    async def _process_queries_batch(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def acquire_data_batches(
+        self,
+        queries: List[Query]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Acquire data one priority group at a time, highest priority first
+        
+        Each group's results are yielded as soon as they are fetched so later
+        pipeline stages can start on them while lower priority queries run.
+        """
+        
+        # One timestamp for the whole acquisition run, shared by every record
+        batch_ts = datetime.utcnow().isoformat()
+        
+        for priority in ("high", "medium", "low"):
+            priority_queries = [q for q in queries if q.priority == priority]
+            if priority_queries:
+                yield await self._process_queries_batch(priority_queries, batch_ts)
+    
+    async def _process_queries_batch(
+        self,
+        queries: List[Query],
+        batch_ts: str
+    ) -> List[Dict[str, Any]]:
         """Process a batch of queries concurrently"""
         
-        tasks = []
-        for query in queries:
-            task = self._acquire_data_for_query(query)
-            tasks.append(task)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_QUERIES)
+        
+        async def acquire_bounded(query: Query) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._acquire_data_for_query(query, batch_ts)
         
-        # Process queries concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Process queries concurrently, bounded by the semaphore
+        results = await asyncio.gather(
+            *(acquire_bounded(query) for query in queries),
+            return_exceptions=True
+        )
         
         # Filter out exceptions and flatten results
         data = []
@@ -71,11 +102,11 @@ class DataAcquirer:
         
         return data
     
-    async def _acquire_data_for_query(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _acquire_data_for_query(self, query: Query, batch_ts: str) -> List[Dict[str, Any]]:
         """Acquire data for a single query"""
         
-        query_text = query.get("query", "")
-        query_type = query.get("type", "keyword_search")
+        query_text = query.query
+        query_type = query.type
         
         self.logger.info(f"Acquiring data for query: {query_text}")
         
@@ -83,29 +114,26 @@ class DataAcquirer:
         
         # Acquire from different sources based on query type
         if query_type == "keyword_search":
-            data.extend(await self._search_government_sites(query_text))
-            data.extend(await self._search_regulatory_bodies(query_text))
-            data.extend(await self._search_news_sources(query_text))
+            # The three source searches are independent, so run them together
+            for source_data in await asyncio.gather(
+                self._search_government_sites(query_text, batch_ts),
+                self._search_regulatory_bodies(query_text, batch_ts),
+                self._search_news_sources(query_text, batch_ts)
+            ):
+                data.extend(source_data)
         elif query_type == "industry_search":
-            data.extend(await self._search_industry_sources(query_text))
+            data.extend(await self._search_industry_sources(query_text, batch_ts))
         elif query_type == "jurisdiction_search":
-            data.extend(await self._search_jurisdiction_sources(query_text))
+            data.extend(await self._search_jurisdiction_sources(query_text, batch_ts))
         
         return data
     
-    async def _search_government_sites(self, query: str) -> List[Dict[str, Any]]:
+    async def _search_government_sites(self, query: str, batch_ts: str) -> List[Dict[str, Any]]:
         """Search government websites for regulatory information"""
         
-        government_sites = [
-            "https://www.gov.uk/search?q=",
-            "https://www.usa.gov/search?query=",
-            "https://ec.europa.eu/search?query=",
-            "https://www.federalregister.gov/search?q="
-        ]
-        
         data = []
         
-        for site in government_sites:
+        for site in self.GOVERNMENT_SITES:
             try:
                 # Simulate API call to government site
                 search_url = f"{site}{query}"
@@ -116,7 +144,7 @@ class DataAcquirer:
                     "url": search_url,
                     "title": f"Government regulation: {query}",
                     "content": f"Official government information about {query}",
-                    "date": datetime.utcnow().isoformat(),
+                    "date": batch_ts,
                     "relevance_score": 0.9,
                     "source_type": "government"
                 }
@@ -128,18 +156,12 @@ class DataAcquirer:
         
         return data
     
-    async def _search_regulatory_bodies(self, query: str) -> List[Dict[str, Any]]:
+    async def _search_regulatory_bodies(self, query: str, batch_ts: str) -> List[Dict[str, Any]]:
         """Search regulatory body websites"""
         
-        regulatory_bodies = [
-            "SEC", "FDA", "EPA", "FTC", "FCC",  # US
-            "FCA", "MHRA", "HSE", "Ofcom",      # UK
-            "EMA", "EFSA", "EASA", "ACER"       # EU
-        ]
-        
         data = []
         
-        for body in regulatory_bodies:
+        for body in self.REGULATORY_BODIES:
             try:
                 # Mock regulatory body search
                 mock_data = {
@@ -147,7 +169,7 @@ class DataAcquirer:
                     "url": f"https://{body.lower()}.gov/search?q={query}",
                     "title": f"{body} regulation: {query}",
                     "content": f"Regulatory guidance from {body} regarding {query}",
-                    "date": datetime.utcnow().isoformat(),
+                    "date": batch_ts,
                     "relevance_score": 0.85,
                     "source_type": "regulatory_body",
                     "regulatory_body": body
@@ -160,16 +182,12 @@ class DataAcquirer:
         
         return data
     
-    async def _search_news_sources(self, query: str) -> List[Dict[str, Any]]:
+    async def _search_news_sources(self, query: str, batch_ts: str) -> List[Dict[str, Any]]:
         """Search news sources for regulatory updates"""
         
-        news_sources = [
-            "Reuters", "Bloomberg", "Financial Times", "Wall Street Journal"
-        ]
-        
         data = []
         
-        for source in news_sources:
+        for source in self.NEWS_SOURCES:
             try:
                 # Mock news search
                 mock_data = {
@@ -177,7 +195,7 @@ class DataAcquirer:
                     "url": f"https://{source.lower().replace(' ', '')}.com/search?q={query}",
                     "title": f"Regulatory update: {query}",
                     "content": f"Latest news from {source} about regulatory changes related to {query}",
-                    "date": datetime.utcnow().isoformat(),
+                    "date": batch_ts,
                     "relevance_score": 0.7,
                     "source_type": "news",
                     "news_source": source
@@ -190,7 +208,7 @@ class DataAcquirer:
         
         return data
     
-    async def _search_industry_sources(self, query: str) -> List[Dict[str, Any]]:
+    async def _search_industry_sources(self, query: str, batch_ts: str) -> List[Dict[str, Any]]:
         """Search industry-specific sources"""
         
         data = []
@@ -201,7 +219,7 @@ class DataAcquirer:
             "url": f"https://industry-standards.org/search?q={query}",
             "title": f"Industry standard: {query}",
             "content": f"Industry-specific guidance and standards for {query}",
-            "date": datetime.utcnow().isoformat(),
+            "date": batch_ts,
             "relevance_score": 0.8,
             "source_type": "industry"
         }
@@ -210,7 +228,7 @@ class DataAcquirer:
         
         return data
     
-    async def _search_jurisdiction_sources(self, query: str) -> List[Dict[str, Any]]:
+    async def _search_jurisdiction_sources(self, query: str, batch_ts: str) -> List[Dict[str, Any]]:
         """Search jurisdiction-specific sources"""
         
         data = []
@@ -221,7 +239,7 @@ class DataAcquirer:
             "url": f"https://legal-database.gov/search?q={query}",
             "title": f"Legal requirement: {query}",
             "content": f"Jurisdiction-specific legal requirements for {query}",
-            "date": datetime.utcnow().isoformat(),
+            "date": batch_ts,
             "relevance_score": 0.9,
             "source_type": "legal"
         }
@@ -13,9 +13,9 @@ from ...database.session import SessionLocal
 from ...database.models import Report, CompanyProfile, RegulatoryChange
 from ...schemas import AnalysisProgress
 from ...socketio_server import emit_analysis_progress, emit_analysis_complete, emit_analysis_error
-from .query_generator import QueryGenerator
+from .query_generator import Query, generate_queries
 from .data_acquirer import DataAcquirer
-from .content_filter import ContentFilter
+from .content_filter import ContentFilter, DuplicateTracker
 from .ai_analyst import AIAnalyst
 
 logger = logging.getLogger(__name__)
@@ -23,8 +23,10 @@ logger = logging.getLogger(__name__)
 class AnalysisOrchestrator:
     """Orchestrates the complete regulatory analysis pipeline"""
     
+    # Maximum number of batches buffered between two pipeline stages
+    STAGE_QUEUE_SIZE = 64
+    
     def __init__(self):
-        self.query_generator = QueryGenerator()
         self.data_acquirer = DataAcquirer()
         self.content_filter = ContentFilter()
         self.ai_analyst = AIAnalyst()
@@ -55,27 +57,17 @@ class AnalysisOrchestrator:
             
             # Stage 1: Query Generation
             await self._update_progress(db, report_id, 10, "query_generation", "Generating search queries...")
-            queries = await self.query_generator.generate_queries(
+            queries = await generate_queries(
                 company_profile=company_profile,
                 analysis_type=analysis_type,
                 scope=scope,
                 keywords=keywords
             )
             
-            # Stage 2: Data Acquisition
-            await self._update_progress(db, report_id, 30, "data_acquisition", "Acquiring regulatory data...")
-            raw_data = await self.data_acquirer.acquire_data(queries)
-            
-            # Stage 3: Content Filtering
-            await self._update_progress(db, report_id, 60, "content_filtering", "Filtering relevant content...")
-            filtered_data = await self.content_filter.filter_content(
-                raw_data, company_profile, analysis_type
-            )
-            
-            # Stage 4: AI Analysis
-            await self._update_progress(db, report_id, 80, "ai_analysis", "Analyzing regulatory changes...")
-            regulatory_changes = await self.ai_analyst.analyze_changes(
-                filtered_data, company_profile, analysis_type
+            # Stages 2-4: Data Acquisition, Content Filtering and AI Analysis
+            # run concurrently, handing batches downstream as they are ready
+            regulatory_changes = await self._run_streaming_stages(
+                db, report_id, queries, company_profile, analysis_type
             )
             
             # Save regulatory changes to database
@@ -118,6 +110,60 @@ class AnalysisOrchestrator:
         finally:
             db.close()
     
+    async def _run_streaming_stages(
+        self,
+        db: Session,
+        report_id: int,
+        queries: List[Query],
+        company_profile: CompanyProfile,
+        analysis_type: str
+    ) -> List[Dict[str, Any]]:
+        """Run acquisition, filtering and AI analysis as a queued pipeline"""
+        raw_queue: asyncio.Queue = asyncio.Queue(maxsize=self.STAGE_QUEUE_SIZE)
+        filtered_queue: asyncio.Queue = asyncio.Queue(maxsize=self.STAGE_QUEUE_SIZE)
+        regulatory_changes: List[Dict[str, Any]] = []
+        
+        async def acquire():
+            await self._update_progress(db, report_id, 30, "data_acquisition", "Acquiring regulatory data...")
+            async for batch in self.data_acquirer.acquire_data_batches(queries):
+                await raw_queue.put(batch)
+            await raw_queue.put(None)
+        
+        async def filter_content():
+            duplicate_tracker = DuplicateTracker()
+            started = False
+            while (batch := await raw_queue.get()) is not None:
+                if not started:
+                    started = True
+                    await self._update_progress(db, report_id, 60, "content_filtering", "Filtering relevant content...")
+                filtered = await self.content_filter.filter_content(
+                    batch, company_profile, analysis_type, duplicate_tracker
+                )
+                if filtered:
+                    await filtered_queue.put(filtered)
+            await filtered_queue.put(None)
+        
+        async def analyze():
+            started = False
+            while (batch := await filtered_queue.get()) is not None:
+                if not started:
+                    started = True
+                    await self._update_progress(db, report_id, 80, "ai_analysis", "Analyzing regulatory changes...")
+                regulatory_changes.extend(await self.ai_analyst.analyze_changes(
+                    batch, company_profile, analysis_type
+                ))
+        
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(acquire())
+                task_group.create_task(filter_content())
+                task_group.create_task(analyze())
+        except ExceptionGroup as eg:
+            # Surface the stage failure itself rather than the group wrapper
+            raise eg.exceptions[0]
+        
+        return regulatory_changes
+    
     async def _update_progress(
         self,
         db: Session,
@@ -150,21 +196,22 @@ class AnalysisOrchestrator:
         regulatory_changes: List[Dict[str, Any]]
     ):
         """Save regulatory changes to database"""
-        for change_data in regulatory_changes:
-            regulatory_change = RegulatoryChange(
-                report_id=report_id,
-                source_url=change_data.get("source_url", ""),
-                title=change_data.get("title", ""),
-                summary=change_data.get("summary", ""),
-                impact_assessment=change_data.get("impact_assessment", ""),
-                compliance_requirements=change_data.get("compliance_requirements", ""),
-                implementation_timeline=change_data.get("implementation_timeline", ""),
-                risk_level=change_data.get("risk_level", "medium"),
-                confidence_score=change_data.get("confidence_score", 0.5),
-                relevant_sections=change_data.get("relevant_sections", []),
-                affected_areas=change_data.get("affected_areas", []),
-                action_items=change_data.get("action_items", [])
-            )
-            db.add(regulatory_change)
+        db.bulk_insert_mappings(RegulatoryChange, [
+            {
+                "report_id": report_id,
+                "source_url": change_data.get("source_url", ""),
+                "title": change_data.get("title", ""),
+                "summary": change_data.get("summary", ""),
+                "impact_assessment": change_data.get("impact_assessment", ""),
+                "compliance_requirements": change_data.get("compliance_requirements", ""),
+                "implementation_timeline": change_data.get("implementation_timeline", ""),
+                "risk_level": change_data.get("risk_level", "medium"),
+                "confidence_score": change_data.get("confidence_score", 0.5),
+                "relevant_sections": change_data.get("relevant_sections", []),
+                "affected_areas": change_data.get("affected_areas", []),
+                "action_items": change_data.get("action_items", [])
+            }
+            for change_data in regulatory_changes
+        ])
         
         db.commit()
@@ -4,190 +4,235 @@ Generates search queries based on company profile and analysis requirements
 """
 
 import logging
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Pattern, Tuple
 from ...database.models import CompanyProfile
 
 logger = logging.getLogger(__name__)
 
-class QueryGenerator:
-    """Generates search queries for regulatory data acquisition"""
+class Query(NamedTuple):
+    """A single search query handed to the data acquisition stage"""
+    query: str
+    type: str
+    source: str
+    priority: str
+    metadata: Optional[Dict[str, Any]] = None
+
+# Static query tables; keys are matched as substrings of the lowercased profile value
+_INDUSTRY_TERMS: Dict[str, Tuple[str, ...]] = {
+    "technology": (
+        "data protection regulations",
+        "cybersecurity compliance",
+        "software licensing laws",
+        "AI governance regulations"
+    ),
+    "energy": (
+        "environmental regulations",
+        "safety standards",
+        "energy efficiency requirements",
+        "renewable energy policies"
+    ),
+    "healthcare": (
+        "medical device regulations",
+        "patient data privacy",
+        "clinical trial requirements",
+        "healthcare compliance"
+    ),
+    "financial": (
+        "financial services regulations",
+        "anti-money laundering",
+        "consumer protection laws",
+        "banking compliance"
+    )
+}
+
+_JURISDICTION_TERMS: Dict[str, Tuple[str, ...]] = {
+    "us": (
+        "federal regulations",
+        "state compliance requirements",
+        "SEC regulations",
+        "FDA guidelines"
+    ),
+    "eu": (
+        "EU directives",
+        "GDPR compliance",
+        "CE marking requirements",
+        "European standards"
+    ),
+    "uk": (
+        "UK regulations",
+        "post-Brexit compliance",
+        "British standards",
+        "UKCA marking"
+    )
+}
+
+_COMPREHENSIVE_TERMS: Tuple[str, ...] = (
+    "regulatory changes",
+    "compliance updates",
+    "new legislation",
+    "policy updates",
+    "regulatory guidance"
+)
+
+# Scope tokens: a letter followed by at least three word characters or hyphens
+_SCOPE_TOKEN_RE = re.compile(r"[^\W\d_][\w-]{3,}")
+
+# Filler words in scope text that would only produce low-value searches
+_SCOPE_STOPWORDS = frozenset({
+    "about", "also", "been", "between", "from", "have", "into", "over",
+    "should", "such", "than", "that", "their", "them", "then", "there",
+    "these", "they", "this", "those", "under", "upon", "were", "what",
+    "when", "where", "which", "will", "with", "within", "without", "would",
+    "your", "regulation", "regulations"
+})
+
+# Priority follows from where a query came from, so it is fixed at build time
+_PRIORITY_BY_SOURCE = {
+    "company_profile": "high",
+    "analysis_request": "medium",
+    "industry_mapping": "high",
+    "jurisdiction_mapping": "high",
+    "comprehensive_analysis": "medium",
+    "scope_analysis": "high"
+}
+
+# Rank used to keep the highest priority entry when a query repeats
+_PRIORITY_RANK = {"high": 2, "medium": 1, "low": 0}.get
+
+def _make_query(term: str, query_type: str, source: str) -> Query:
+    """Build a query whose priority is looked up from its source"""
+    return Query(term, query_type, source, _PRIORITY_BY_SOURCE[source])
+
+def _keyed(query: Query) -> Tuple[str, Query]:
+    """Pair a query with its normalized dedup key"""
+    return query.query.lower().strip(), query
+
+def _add_query(queries: Dict[str, Query], keyed: Tuple[str, Query]) -> None:
+    """Add a keyed query, keeping only the highest priority entry per query string"""
+    key, query = keyed
+    previous = queries.get(key)
+    if previous is None or _PRIORITY_RANK(previous.priority, 0) < _PRIORITY_RANK(query.priority, 0):
+        queries[key] = query
+
+def _keyed_table(terms: Tuple[str, ...], query_type: str, source: str) -> Tuple[Tuple[str, Query], ...]:
+    """Build the keyed queries for a static term table"""
+    return tuple(_keyed(_make_query(term, query_type, source)) for term in terms)
+
+# Static queries are built and normalized once at import, not per generation
+_INDUSTRY_QUERIES = {key: _keyed_table(terms, "industry_search", "industry_mapping") for key, terms in _INDUSTRY_TERMS.items()}
+_JURISDICTION_QUERIES = {key: _keyed_table(terms, "jurisdiction_search", "jurisdiction_mapping") for key, terms in _JURISDICTION_TERMS.items()}
+_COMPREHENSIVE_QUERIES = _keyed_table(_COMPREHENSIVE_TERMS, "comprehensive_search", "comprehensive_analysis")
+
+@lru_cache(maxsize=None)
+def _key_matcher(keys: Tuple[str, ...]) -> Pattern:
+    """Compile mapping keys into one pattern that reports every (overlapping) match"""
+    alternation = "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+def _matched_keys(mapping: Dict[str, Tuple], text: str) -> List[str]:
+    """Return the mapping keys found in text, in mapping order, with one regex scan"""
+    found = set(_key_matcher(tuple(mapping)).findall(text))
+    return [key for key in mapping if key in found]
+
+
+def _industry_queries(industry: str) -> Iterator[Tuple[str, Query]]:
+    """Generate industry-specific queries"""
+    industry_lower = industry.lower()
     
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+    for key in _matched_keys(_INDUSTRY_QUERIES, industry_lower):
+        yield from _INDUSTRY_QUERIES[key]
+
+
+def _jurisdiction_queries(jurisdiction: str) -> Iterator[Tuple[str, Query]]:
+    """Generate jurisdiction-specific queries"""
+    jurisdiction_lower = jurisdiction.lower()
+    
+    for key in _matched_keys(_JURISDICTION_QUERIES, jurisdiction_lower):
+        yield from _JURISDICTION_QUERIES[key]
+
+
+def _comprehensive_queries() -> Iterator[Tuple[str, Query]]:
+    """Generate comprehensive analysis queries"""
+    return iter(_COMPREHENSIVE_QUERIES)
+
+
+def _targeted_queries(scope: Optional[str]) -> Iterator[Tuple[str, Query]]:
+    """Generate targeted analysis queries based on scope"""
+    if scope:
+        # One regex scan yields the 4+ character terms; dict.fromkeys
+        # drops repeats, keeping order
+        for term in dict.fromkeys(_SCOPE_TOKEN_RE.findall(scope.lower())):
+            if term not in _SCOPE_STOPWORDS:
+                # Lowercased tokens are already normalized keys
+                yield term, _make_query(term, "targeted_search", "scope_analysis")
+
+
+@lru_cache(maxsize=1024)
+def _build_queries(
+    profile_keywords: Tuple[str, ...],
+    industry: Optional[str],
+    jurisdiction: Optional[str],
+    analysis_type: str,
+    scope: Optional[str],
+    keywords: Tuple[str, ...]
+) -> Tuple[Query, ...]:
+    """Build the deduplicated query set, cached per distinct set of inputs"""
+    
+    # Every category streams into this one dict, keyed by normalized
+    # query string so repeated queries collapse in a single pass
+    queries: Dict[str, Query] = {}
+    
+    # Base queries from company keywords
+    for keyword in profile_keywords:
+        _add_query(queries, _keyed(_make_query(keyword, "keyword_search", "company_profile")))
+    
+    # Additional keywords from analysis request
+    for keyword in keywords:
+        _add_query(queries, _keyed(_make_query(keyword, "keyword_search", "analysis_request")))
     
-    async def generate_queries(
-        self,
-        company_profile: CompanyProfile,
-        analysis_type: str = "comprehensive",
-        scope: str = None,
-        keywords: List[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Generate search queries based on company profile and requirements"""
-        
-        self.logger.info(f"Generating queries for {company_profile.company_name}")
-        
-        queries = []
-        
-        # Base queries from company keywords
-        if company_profile.keywords:
-            for keyword in company_profile.keywords:
-                queries.append({
-                    "query": keyword,
-                    "type": "keyword_search",
-                    "source": "company_profile",
-                    "priority": "high"
-                })
-        
-        # Additional keywords from analysis request
-        if keywords:
-            for keyword in keywords:
-                queries.append({
-                    "query": keyword,
-                    "type": "keyword_search",
-                    "source": "analysis_request",
-                    "priority": "medium"
-                })
-        
-        # Industry-specific queries
-        if company_profile.industry:
-            industry_queries = self._get_industry_queries(company_profile.industry)
-            queries.extend(industry_queries)
-        
-        # Jurisdiction-specific queries
-        if company_profile.jurisdiction:
-            jurisdiction_queries = self._get_jurisdiction_queries(company_profile.jurisdiction)
-            queries.extend(jurisdiction_queries)
-        
-        # Analysis type specific queries
-        if analysis_type == "comprehensive":
-            comprehensive_queries = self._get_comprehensive_queries(company_profile)
-            queries.extend(comprehensive_queries)
-        elif analysis_type == "targeted":
-            targeted_queries = self._get_targeted_queries(company_profile, scope)
-            queries.extend(targeted_queries)
-        
-        self.logger.info(f"Generated {len(queries)} queries")
-        return queries
+    # Industry-specific queries
+    if industry:
+        for keyed in _industry_queries(industry):
+            _add_query(queries, keyed)
     
-    def _get_industry_queries(self, industry: str) -> List[Dict[str, Any]]:
-        """Generate industry-specific queries"""
-        industry_mapping = {
-            "technology": [
-                "data protection regulations",
-                "cybersecurity compliance",
-                "software licensing laws",
-                "AI governance regulations"
-            ],
-            "energy": [
-                "environmental regulations",
-                "safety standards",
-                "energy efficiency requirements",
-                "renewable energy policies"
-            ],
-            "healthcare": [
-                "medical device regulations",
-                "patient data privacy",
-                "clinical trial requirements",
-                "healthcare compliance"
-            ],
-            "financial": [
-                "financial services regulations",
-                "anti-money laundering",
-                "consumer protection laws",
-                "banking compliance"
-            ]
-        }
-        
-        queries = []
-        industry_lower = industry.lower()
-        
-        for key, terms in industry_mapping.items():
-            if key in industry_lower:
-                for term in terms:
-                    queries.append({
-                        "query": term,
-                        "type": "industry_search",
-                        "source": "industry_mapping",
-                        "priority": "high"
-                    })
-        
-        return queries
+    # Jurisdiction-specific queries
+    if jurisdiction:
+        for keyed in _jurisdiction_queries(jurisdiction):
+            _add_query(queries, keyed)
+    
+    # Analysis type specific queries
+    if analysis_type == "comprehensive":
+        for keyed in _comprehensive_queries():
+            _add_query(queries, keyed)
+    elif analysis_type == "targeted":
+        for keyed in _targeted_queries(scope):
+            _add_query(queries, keyed)
+    
+    return tuple(queries.values())
+
+
+async def generate_queries(
+    company_profile: CompanyProfile,
+    analysis_type: str = "comprehensive",
+    scope: str = None,
+    keywords: List[str] = None
+) -> List[Query]:
+    """Generate search queries based on company profile and requirements"""
     
-    def _get_jurisdiction_queries(self, jurisdiction: str) -> List[Dict[str, Any]]:
-        """Generate jurisdiction-specific queries"""
-        jurisdiction_mapping = {
-            "us": [
-                "federal regulations",
-                "state compliance requirements",
-                "SEC regulations",
-                "FDA guidelines"
-            ],
-            "eu": [
-                "EU directives",
-                "GDPR compliance",
-                "CE marking requirements",
-                "European standards"
-            ],
-            "uk": [
-                "UK regulations",
-                "post-Brexit compliance",
-                "British standards",
-                "UKCA marking"
-            ]
-        }
-        
-        queries = []
-        jurisdiction_lower = jurisdiction.lower()
-        
-        for key, terms in jurisdiction_mapping.items():
-            if key in jurisdiction_lower:
-                for term in terms:
-                    queries.append({
-                        "query": term,
-                        "type": "jurisdiction_search",
-                        "source": "jurisdiction_mapping",
-                        "priority": "high"
-                    })
-        
-        return queries
+    logger.info(f"Generating queries for {company_profile.company_name}")
     
-    def _get_comprehensive_queries(self, company_profile: CompanyProfile) -> List[Dict[str, Any]]:
-        """Generate comprehensive analysis queries"""
-        queries = []
-        
-        # General regulatory queries
-        general_queries = [
-            "regulatory changes",
-            "compliance updates",
-            "new legislation",
-            "policy updates",
-            "regulatory guidance"
-        ]
-        
-        for query in general_queries:
-            queries.append({
-                "query": query,
-                "type": "comprehensive_search",
-                "source": "comprehensive_analysis",
-                "priority": "medium"
-            })
-        
-        return queries
+    # Keyed on every profile field the generator reads, so an edited
+    # profile never reuses a stale entry
+    queries = _build_queries(
+        tuple(company_profile.keywords or ()),
+        company_profile.industry,
+        company_profile.jurisdiction,
+        analysis_type,
+        scope,
+        tuple(keywords or ())
+    )
     
-    def _get_targeted_queries(self, company_profile: CompanyProfile, scope: str) -> List[Dict[str, Any]]:
-        """Generate targeted analysis queries based on scope"""
-        queries = []
-        
-        if scope:
-            # Parse scope for specific terms
-            scope_terms = scope.lower().split()
-            for term in scope_terms:
-                if len(term) > 3:  # Filter out short words
-                    queries.append({
-                        "query": term,
-                        "type": "targeted_search",
-                        "source": "scope_analysis",
-                        "priority": "high"
-                    })
-        
-        return queries
\ No newline at end of file
+    logger.info(f"Generated {len(queries)} queries")
+    return list(queries)
@@ -2,159 +2,210 @@
 Database Models for Regulatory Intelligence Platform
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import String, DateTime, Text, ForeignKey, JSON, Index, Enum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import List, Optional
+import enum
 import uuid
 
 from .session import Base
 
+# Binary JSONB on PostgreSQL (no reparse on read, GIN-indexable); plain JSON elsewhere.
+# none_as_null stores the dataclass default None as SQL NULL rather than JSON 'null'
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+# Low-cardinality columns are stored as native enums; StrEnum keeps
+# comparisons against plain strings working throughout the codebase
+class CompanySize(enum.StrEnum):
+    small = "small"
+    medium = "medium"
+    large = "large"
+
+class ReportStatus(enum.StrEnum):
+    pending = "pending"
+    in_progress = "in_progress"
+    completed = "completed"
+    failed = "failed"
+
+class RiskLevel(enum.StrEnum):
+    low = "low"
+    medium = "medium"
+    high = "high"
+    critical = "critical"
+
+class SourceType(enum.StrEnum):
+    government = "government"
+    regulatory_body = "regulatory_body"
+    news = "news"
+    industry = "industry"
+    legal = "legal"
+
+class Frequency(enum.StrEnum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+    quarterly = "quarterly"
+
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    username = Column(String(100), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    full_name = Column(String(255))
-    is_active = Column(Boolean, default=True)
-    is_superuser = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    username: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    hashed_password: Mapped[str] = mapped_column(String(255))
+    full_name: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    is_superuser: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
     
     # Relationships
-    company_profiles = relationship("CompanyProfile", back_populates="user")
-    reports = relationship("Report", back_populates="user")
+    company_profiles: Mapped[List["CompanyProfile"]] = relationship(back_populates="user", init=False, repr=False)
+    reports: Mapped[List["Report"]] = relationship(back_populates="user", init=False, repr=False)
 
 class CompanyProfile(Base):
     __tablename__ = "company_profiles"
+    __table_args__ = (
+        # Backs keyword containment lookups (? / @>)
+        Index("ix_cp_keywords", "keywords", postgresql_using="gin"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    company_name = Column(String(255), nullable=False)
-    industry = Column(String(100))
-    jurisdiction = Column(String(100))
-    company_size = Column(String(50))  # small, medium, large
-    description = Column(Text)
-    keywords = Column(JSON)  # List of relevant keywords
-    trusted_sources = Column(JSON)  # List of trusted source URLs
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    company_name: Mapped[str] = mapped_column(String(255))
+    industry: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    jurisdiction: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    company_size: Mapped[Optional[CompanySize]] = mapped_column(Enum(CompanySize, name="company_size"), default=None)
+    description: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    keywords: Mapped[Optional[list]] = mapped_column(JSONType, default=None)  # List of relevant keywords
+    trusted_sources: Mapped[Optional[list]] = mapped_column(JSONType, default=None)  # List of trusted source URLs
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
     
     # Relationships
-    user = relationship("User", back_populates="company_profiles")
-    reports = relationship("Report", back_populates="company_profile")
+    user: Mapped["User"] = relationship(back_populates="company_profiles", init=False, repr=False)
+    reports: Mapped[List["Report"]] = relationship(back_populates="company_profile", init=False, repr=False)
 
 class Report(Base):
     __tablename__ = "reports"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    company_profile_id = Column(Integer, ForeignKey("company_profiles.id"), nullable=False)
-    title = Column(String(255), nullable=False)
-    status = Column(String(50), default="pending")  # pending, in_progress, completed, failed
-    analysis_type = Column(String(100))  # comprehensive, targeted, monitoring
-    scope = Column(Text)  # Description of analysis scope
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    completed_at = Column(DateTime(timezone=True))
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    company_profile_id: Mapped[int] = mapped_column(ForeignKey("company_profiles.id"), index=True)
+    title: Mapped[str] = mapped_column(String(255))
+    status: Mapped[Optional[ReportStatus]] = mapped_column(Enum(ReportStatus, name="report_status"), default=ReportStatus.pending, index=True)
+    analysis_type: Mapped[Optional[str]] = mapped_column(String(100), default=None)  # comprehensive, targeted, monitoring
+    scope: Mapped[Optional[str]] = mapped_column(Text, default=None)  # Description of analysis scope
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), default=None)
     
     # Relationships
-    user = relationship("User", back_populates="reports")
-    company_profile = relationship("CompanyProfile", back_populates="reports")
-    regulatory_changes = relationship("RegulatoryChange", back_populates="report")
+    user: Mapped["User"] = relationship(back_populates="reports", init=False, repr=False)
+    company_profile: Mapped["CompanyProfile"] = relationship(back_populates="reports", init=False, repr=False)
+    regulatory_changes: Mapped[List["RegulatoryChange"]] = relationship(back_populates="report", init=False, repr=False)
 
 class RegulatoryChange(Base):
     __tablename__ = "regulatory_changes"
+    __table_args__ = (
+        # Backs affected area containment lookups (? / @>)
+        Index("ix_rc_affected_areas", "affected_areas", postgresql_using="gin"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False)
-    source_url = Column(String(500), nullable=False)
-    title = Column(String(500), nullable=False)
-    summary = Column(Text)
-    impact_assessment = Column(Text)
-    compliance_requirements = Column(Text)
-    implementation_timeline = Column(Text)
-    risk_level = Column(String(20))  # low, medium, high, critical
-    confidence_score = Column(Float)  # 0.0 to 1.0
-    relevant_sections = Column(JSON)  # List of relevant regulatory sections
-    affected_areas = Column(JSON)  # List of affected business areas
-    action_items = Column(JSON)  # List of recommended actions
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    report_id: Mapped[int] = mapped_column(ForeignKey("reports.id"), index=True)
+    source_url: Mapped[str] = mapped_column(String(500))
+    title: Mapped[str] = mapped_column(String(500))
+    summary: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    impact_assessment: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    compliance_requirements: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    implementation_timeline: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    risk_level: Mapped[Optional[RiskLevel]] = mapped_column(Enum(RiskLevel, name="risk_level"), default=None)
+    confidence_score: Mapped[Optional[float]] = mapped_column(default=None)  # 0.0 to 1.0
+    relevant_sections: Mapped[Optional[list]] = mapped_column(JSONType, default=None)  # List of relevant regulatory sections
+    affected_areas: Mapped[Optional[list]] = mapped_column(JSONType, default=None)  # List of affected business areas
+    action_items: Mapped[Optional[list]] = mapped_column(JSONType, default=None)  # List of recommended actions
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
     
     # Relationships
-    report = relationship("Report", back_populates="regulatory_changes")
+    report: Mapped["Report"] = relationship(back_populates="regulatory_changes", init=False, repr=False)
 
 class TrustedSource(Base):
     __tablename__ = "trusted_sources"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
-    url = Column(String(500), nullable=False)
-    source_type = Column(String(100))  # government, regulatory_body, news, industry
-    jurisdiction = Column(String(100))
-    reliability_score = Column(Float, default=0.8)  # 0.0 to 1.0
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    name: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(String(500))
+    source_type: Mapped[Optional[SourceType]] = mapped_column(Enum(SourceType, name="source_type"), default=None)
+    jurisdiction: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    reliability_score: Mapped[Optional[float]] = mapped_column(default=0.8)  # 0.0 to 1.0
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # Serves the scheduler's "active and due" scan in one index range
+        Index("ix_schedule_due", "is_active", "next_run"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    company_profile_id = Column(Integer, ForeignKey("company_profiles.id"), nullable=False)
-    name = Column(String(255), nullable=False)
-    frequency = Column(String(50))  # daily, weekly, monthly, quarterly
-    analysis_type = Column(String(100))
-    is_active = Column(Boolean, default=True)
-    last_run = Column(DateTime(timezone=True))
-    next_run = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    company_profile_id: Mapped[int] = mapped_column(ForeignKey("company_profiles.id"), index=True)
+    name: Mapped[str] = mapped_column(String(255))
+    frequency: Mapped[Optional[Frequency]] = mapped_column(Enum(Frequency, name="schedule_frequency"), default=None)
+    analysis_type: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    last_run: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), default=None)
+    next_run: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), index=True, default=None)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
     
     # Relationships
-    user = relationship("User")
-    company_profile = relationship("CompanyProfile")
+    user: Mapped["User"] = relationship(init=False, repr=False)
+    company_profile: Mapped["CompanyProfile"] = relationship(init=False, repr=False)
 
 class BoxDocument(Base):
     __tablename__ = "box_documents"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    report_id = Column(Integer, ForeignKey("reports.id"), nullable=True)
-    box_file_id = Column(String(255), unique=True, nullable=False)
-    box_folder_id = Column(String(255), nullable=True)
-    filename = Column(String(500), nullable=False)
-    file_type = Column(String(100))  # pdf, doc, docx, txt, etc.
-    file_size = Column(Integer)  # Size in bytes
-    description = Column(Text)
-    shared_link = Column(String(1000))  # Box shared link
-    download_url = Column(String(1000))  # Box download URL
-    document_category = Column(String(100))  # compliance_report, regulatory_change, policy_document, audit_report
-    is_public = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    report_id: Mapped[Optional[int]] = mapped_column(ForeignKey("reports.id"), default=None)
+    box_file_id: Mapped[str] = mapped_column(String(255), unique=True)
+    box_folder_id: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    filename: Mapped[str] = mapped_column(String(500))
+    file_type: Mapped[Optional[str]] = mapped_column(String(100), default=None)  # pdf, doc, docx, txt, etc.
+    file_size: Mapped[Optional[int]] = mapped_column(default=None)  # Size in bytes
+    description: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    shared_link: Mapped[Optional[str]] = mapped_column(String(1000), default=None)  # Box shared link
+    download_url: Mapped[Optional[str]] = mapped_column(String(1000), default=None)  # Box download URL
+    document_category: Mapped[Optional[str]] = mapped_column(String(100), default=None)  # compliance_report, regulatory_change, policy_document, audit_report
+    is_public: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
     
     # Relationships
-    user = relationship("User")
-    report = relationship("Report")
+    user: Mapped["User"] = relationship(init=False, repr=False)
+    report: Mapped[Optional["Report"]] = relationship(init=False, repr=False)
 
 class BoxFolder(Base):
     __tablename__ = "box_folders"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    company_profile_id = Column(Integer, ForeignKey("company_profiles.id"), nullable=True)
-    box_folder_id = Column(String(255), unique=True, nullable=False)
-    parent_folder_id = Column(String(255), nullable=True)
-    folder_name = Column(String(500), nullable=False)
-    folder_type = Column(String(100))  # regulatory_documents, compliance_reports, etc.
-    description = Column(Text)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, init=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    company_profile_id: Mapped[Optional[int]] = mapped_column(ForeignKey("company_profiles.id"), default=None)
+    box_folder_id: Mapped[str] = mapped_column(String(255), unique=True)
+    parent_folder_id: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    folder_name: Mapped[str] = mapped_column(String(500))
+    folder_type: Mapped[Optional[str]] = mapped_column(String(100), default=None)  # regulatory_documents, compliance_reports, etc.
+    description: Mapped[Optional[str]] = mapped_column(Text, default=None)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=None)
     
     # Relationships
-    user = relationship("User")
-    company_profile = relationship("CompanyProfile")
\ No newline at end of file
+    user: Mapped["User"] = relationship(init=False, repr=False)
+    company_profile: Mapped[Optional["CompanyProfile"]] = relationship(init=False, repr=False)
\ No newline at end of file
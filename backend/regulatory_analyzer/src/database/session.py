@@ -3,8 +3,7 @@ Database Session Configuration
 """
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, sessionmaker
 import os
 from dotenv import load_dotenv
 
@@ -15,7 +14,12 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:Shreyas%402005@l
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+class Base(MappedAsDataclass, DeclarativeBase, kw_only=True, eq=False):
+    """Declarative base mapping every model as a dataclass
+    
+    kw_only keeps keyword construction order-independent; eq=False keeps
+    identity equality and hashing, as with plain declarative models.
+    """
 
 def get_db():
     """Dependency to get database session"""
@@ -2,32 +2,16 @@
 Monitoring and metrics for the Regulatory Intelligence Platform
 """
 
+import asyncio
 import time
 import logging
 from functools import wraps
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import Request, Response
+from fastapi import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
-
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+import orjson
 
 # Prometheus metrics
 REQUEST_COUNT = Counter(
@@ -70,36 +54,62 @@ AI_API_CALLS = Counter(
     ['provider', 'status']
 )
 
-logger = structlog.get_logger()
+# Invariant context is bound once; the proxy resolves on first use, after setup_logging
+logger = structlog.get_logger(__name__, service="regulatory_analyzer")
 
-def monitor_requests(func):
-    """Decorator to monitor API requests"""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        start_time = time.time()
+# Label-bound request metric children, resolved once per label set
+_REQUEST_METRICS: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+
+def _request_metrics(method: str, endpoint: str, status_code: int) -> Tuple[Any, Any]:
+    """Get the (count, duration) metric children for a request label set"""
+    key = (method, endpoint, status_code)
+    children = _REQUEST_METRICS.get(key)
+    if children is None:
+        children = (
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status_code=status_code),
+            REQUEST_DURATION.labels(method=method, endpoint=endpoint)
+        )
+        _REQUEST_METRICS[key] = children
+    return children
+
+def _route_template(scope: Scope) -> str:
+    """Get the matched route template so endpoint label cardinality stays bounded"""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording count and duration metrics for every HTTP request"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Extract request info if available
-        request = None
-        for arg in args:
-            if isinstance(arg, Request):
-                request = arg
-                break
+        start_ns = time.perf_counter_ns()
+        status_code = 500
         
-        method = request.method if request else "unknown"
-        endpoint = request.url.path if request else "unknown"
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
         try:
-            result = await func(*args, **kwargs)
-            status_code = 200
-            return result
+            await self.app(scope, receive, send_with_status)
         except Exception as e:
-            status_code = 500
-            logger.error("Request failed", method=method, endpoint=endpoint, error=str(e))
+            logger.error("Request failed", method=scope["method"], endpoint=_route_template(scope), error=str(e))
             raise
         finally:
-            duration = time.time() - start_time
-            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status_code=status_code).inc()
-            REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
+            duration = (time.perf_counter_ns() - start_ns) * 1e-9
+            method = scope["method"]
+            # The router fills in scope["route"] while handling the request
+            endpoint = _route_template(scope)
+            request_count, request_duration = _request_metrics(method, endpoint, status_code)
+            request_count.inc()
+            request_duration.observe(duration)
             
             logger.info(
                 "Request completed",
@@ -108,14 +118,12 @@ def monitor_requests(func):
                 status_code=status_code,
                 duration=duration
             )
-    
-    return wrapper
 
 def monitor_analysis(func):
     """Decorator to monitor analysis operations"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         analysis_type = kwargs.get('analysis_type', 'unknown')
         
         try:
@@ -127,7 +135,7 @@ def monitor_analysis(func):
             logger.error("Analysis failed", analysis_type=analysis_type, error=str(e))
             raise
         finally:
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) * 1e-9
             ANALYSIS_COUNT.labels(analysis_type=analysis_type, status=status).inc()
             ANALYSIS_DURATION.labels(analysis_type=analysis_type).observe(duration)
             
@@ -169,19 +177,24 @@ class MetricsCollector:
     """Collects and exposes application metrics"""
     
     def __init__(self):
-        self.logger = structlog.get_logger()
+        self.logger = logger
+        self._start_ns = time.monotonic_ns()
     
     def get_metrics(self) -> str:
         """Get Prometheus metrics"""
         return generate_latest()
     
+    async def get_metrics_async(self) -> bytes:
+        """Get Prometheus metrics, serialized in a worker thread off the event loop"""
+        return await asyncio.to_thread(generate_latest)
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get application health status"""
         return {
             "status": "healthy",
             "timestamp": time.time(),
             "version": "1.0.0",
-            "uptime": time.time() - self._start_time,
+            "uptime": (time.monotonic_ns() - self._start_ns) * 1e-9,
             "metrics": {
                 "total_requests": 0,  # Will be populated by actual request tracking
                 "active_connections": 0,  # Will be populated by WebSocket tracking
@@ -202,9 +215,12 @@ class MetricsCollector:
 
 # Global metrics collector instance
 metrics_collector = MetricsCollector()
-metrics_collector._start_time = time.time()
 
 # Logging configuration
+def _dumps(obj: Any, default: Any = None) -> str:
+    """Serialize a log event with orjson, keeping structlog's str contract"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 def setup_logging(log_level: str = "INFO"):
     """Setup application logging"""
     import os
@@ -219,11 +235,25 @@ def setup_logging(log_level: str = "INFO"):
         ]
     )
     
-    # Configure structlog
+    # Configure structlog; the filtering wrapper drops below-level events
+    # before any processor runs
     structlog.configure(
+        processors=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(serializer=_dumps)
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, log_level.upper())
-        )
+        ),
+        cache_logger_on_first_use=True,
     )
 
 def log_analysis_event(event_type: str, **kwargs):
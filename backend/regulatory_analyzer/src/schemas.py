@@ -2,12 +2,55 @@
 Pydantic Schemas for API Validation and Serialization
 """
 
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Optional, List, Dict, Any, Callable, Tuple, Type, TypeVar
 from datetime import datetime
+import msgspec
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from .database.models import CompanySize, ReportStatus, RiskLevel, SourceType, Frequency
+
+class BaseSchema(BaseModel):
+    """Base for all schemas; validators are built on first use, not at import"""
+    model_config = ConfigDict(defer_build=True)
+
+_MISSING = object()
+
+StructT = TypeVar("StructT", bound=msgspec.Struct)
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded with msgspec"""
+    
+    def render(self, content: Any) -> bytes:
+        """Encode content straight to JSON bytes"""
+        return msgspec.json.encode(content)
+
+def msgspec_body(struct_type: Type[StructT]) -> Callable:
+    """Build a dependency that decodes the request body into a msgspec Struct"""
+    async def decode(request: Request) -> StructT:
+        try:
+            # strict=False keeps pydantic's lax coercion of e.g. "1" -> 1
+            return msgspec.json.decode(await request.body(), type=struct_type, strict=False)
+        except msgspec.ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except msgspec.DecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+    return decode
+
+class ORMResponse(BaseSchema):
+    """Base for response schemas read from trusted ORM rows"""
+    
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """Build from an ORM row without re-running field validation"""
+        values = {name: getattr(obj, name, _MISSING) for name in cls.model_fields}
+        return cls.model_construct(**{
+            name: value for name, value in values.items() if value is not _MISSING
+        })
 
 # User Schemas
-class UserBase(BaseModel):
+class UserBase(BaseSchema):
     email: EmailStr
     username: str
     full_name: Optional[str] = None
@@ -15,13 +58,18 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
-class UserUpdate(BaseModel):
+class UserUpdate(BaseSchema):
     email: Optional[EmailStr] = None
     username: Optional[str] = None
     full_name: Optional[str] = None
     password: Optional[str] = None
 
-class User(UserBase):
+class User(ORMResponse):
+    # Emails read back from the database were validated on the way in,
+    # so the response model skips EmailStr
+    email: str
+    username: str
+    full_name: Optional[str] = None
     id: int
     is_active: bool
     is_superuser: bool
@@ -32,11 +80,11 @@ class User(UserBase):
         from_attributes = True
 
 # Company Profile Schemas
-class CompanyProfileBase(BaseModel):
+class CompanyProfileBase(BaseSchema):
     company_name: str
     industry: Optional[str] = None
     jurisdiction: Optional[str] = None
-    company_size: Optional[str] = None
+    company_size: Optional[CompanySize] = None
     description: Optional[str] = None
     keywords: Optional[List[str]] = None
     trusted_sources: Optional[List[str]] = None
@@ -44,16 +92,16 @@ class CompanyProfileBase(BaseModel):
 class CompanyProfileCreate(CompanyProfileBase):
     pass
 
-class CompanyProfileUpdate(BaseModel):
+class CompanyProfileUpdate(BaseSchema):
     company_name: Optional[str] = None
     industry: Optional[str] = None
     jurisdiction: Optional[str] = None
-    company_size: Optional[str] = None
+    company_size: Optional[CompanySize] = None
     description: Optional[str] = None
     keywords: Optional[List[str]] = None
     trusted_sources: Optional[List[str]] = None
 
-class CompanyProfile(CompanyProfileBase):
+class CompanyProfile(CompanyProfileBase, ORMResponse):
     id: int
     user_id: int
     created_at: datetime
@@ -63,7 +111,7 @@ class CompanyProfile(CompanyProfileBase):
         from_attributes = True
 
 # Report Schemas
-class ReportBase(BaseModel):
+class ReportBase(BaseSchema):
     title: str
     analysis_type: str
     scope: Optional[str] = None
@@ -71,13 +119,13 @@ class ReportBase(BaseModel):
 class ReportCreate(ReportBase):
     company_profile_id: int
 
-class ReportUpdate(BaseModel):
+class ReportUpdate(BaseSchema):
     title: Optional[str] = None
     analysis_type: Optional[str] = None
     scope: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[ReportStatus] = None
 
-class Report(ReportBase):
+class Report(ReportBase, ORMResponse):
     id: int
     user_id: int
     company_profile_id: int
@@ -95,14 +143,14 @@ class ReportResponse(Report):
     current_stage: Optional[str] = None
 
 # Regulatory Change Schemas
-class RegulatoryChangeBase(BaseModel):
+class RegulatoryChangeBase(BaseSchema):
     source_url: str
     title: str
     summary: Optional[str] = None
     impact_assessment: Optional[str] = None
     compliance_requirements: Optional[str] = None
     implementation_timeline: Optional[str] = None
-    risk_level: Optional[str] = None
+    risk_level: Optional[RiskLevel] = None
     confidence_score: Optional[float] = None
     relevant_sections: Optional[List[str]] = None
     affected_areas: Optional[List[str]] = None
@@ -111,34 +159,48 @@ class RegulatoryChangeBase(BaseModel):
 class RegulatoryChangeCreate(RegulatoryChangeBase):
     report_id: int
 
-class RegulatoryChange(RegulatoryChangeBase):
+class RegulatoryChange(RegulatoryChangeBase, ORMResponse):
     id: int
     report_id: int
     created_at: datetime
+    # Read-only on the response side, so the JSON lists become tuples
+    relevant_sections: Optional[Tuple[str, ...]] = None
+    affected_areas: Optional[Tuple[str, ...]] = None
+    action_items: Optional[Tuple[str, ...]] = None
+    
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """Build from an ORM row, freezing its JSON list columns once"""
+        response = super().from_orm_fast(obj)
+        for name in ("relevant_sections", "affected_areas", "action_items"):
+            value = getattr(response, name)
+            if value is not None:
+                setattr(response, name, tuple(value))
+        return response
     
     class Config:
         from_attributes = True
 
 # Trusted Source Schemas
-class TrustedSourceBase(BaseModel):
+class TrustedSourceBase(BaseSchema):
     name: str
     url: str
-    source_type: Optional[str] = None
+    source_type: Optional[SourceType] = None
     jurisdiction: Optional[str] = None
     reliability_score: Optional[float] = 0.8
 
 class TrustedSourceCreate(TrustedSourceBase):
     pass
 
-class TrustedSourceUpdate(BaseModel):
+class TrustedSourceUpdate(BaseSchema):
     name: Optional[str] = None
     url: Optional[str] = None
-    source_type: Optional[str] = None
+    source_type: Optional[SourceType] = None
     jurisdiction: Optional[str] = None
     reliability_score: Optional[float] = None
     is_active: Optional[bool] = None
 
-class TrustedSource(TrustedSourceBase):
+class TrustedSource(TrustedSourceBase, ORMResponse):
     id: int
     is_active: bool
     created_at: datetime
@@ -148,21 +210,21 @@ class TrustedSource(TrustedSourceBase):
         from_attributes = True
 
 # Schedule Schemas
-class ScheduleBase(BaseModel):
+class ScheduleBase(BaseSchema):
     name: str
-    frequency: str
+    frequency: Frequency
     analysis_type: str
 
 class ScheduleCreate(ScheduleBase):
     company_profile_id: int
 
-class ScheduleUpdate(BaseModel):
+class ScheduleUpdate(BaseSchema):
     name: Optional[str] = None
-    frequency: Optional[str] = None
+    frequency: Optional[Frequency] = None
     analysis_type: Optional[str] = None
     is_active: Optional[bool] = None
 
-class Schedule(ScheduleBase):
+class Schedule(ScheduleBase, ORMResponse):
     id: int
     user_id: int
     company_profile_id: int
@@ -176,40 +238,42 @@ class Schedule(ScheduleBase):
         from_attributes = True
 
 # Authentication Schemas
-class Token(BaseModel):
+# Plain type-checked shapes with no EmailStr or custom validators are
+# msgspec Structs rather than pydantic models
+class Token(msgspec.Struct):
     access_token: str
     token_type: str
 
-class TokenData(BaseModel):
+class TokenData(msgspec.Struct):
     username: Optional[str] = None
 
-class LoginRequest(BaseModel):
+class LoginRequest(msgspec.Struct):
     username: str
     password: str
 
 # Analysis Request Schema
-class AnalysisRequest(BaseModel):
+class AnalysisRequest(msgspec.Struct):
     company_profile_id: int
     analysis_type: str = "comprehensive"
     scope: Optional[str] = None
     keywords: Optional[List[str]] = None
 
 # API Response Schemas
-class AnalysisProgress(BaseModel):
+class AnalysisProgress(msgspec.Struct):
     report_id: int
     status: str
     progress_percentage: int
     current_stage: str
     message: str
 
-class AnalysisResult(BaseModel):
+class AnalysisResult(BaseSchema):
     report_id: int
     status: str
     regulatory_changes: List[RegulatoryChange]
     summary: Dict[str, Any]
 
 # Box API Schemas
-class BoxDocumentBase(BaseModel):
+class BoxDocumentBase(BaseSchema):
     filename: str
     file_type: Optional[str] = None
     file_size: Optional[int] = None
@@ -224,12 +288,12 @@ class BoxDocumentCreate(BoxDocumentBase):
     shared_link: Optional[str] = None
     download_url: Optional[str] = None
 
-class BoxDocumentUpdate(BaseModel):
+class BoxDocumentUpdate(BaseSchema):
     description: Optional[str] = None
     document_category: Optional[str] = None
     is_public: Optional[bool] = None
 
-class BoxDocumentResponse(BoxDocumentBase):
+class BoxDocumentResponse(BoxDocumentBase, ORMResponse):
     id: int
     box_file_id: str
     box_folder_id: Optional[str] = None
@@ -242,7 +306,7 @@ class BoxDocumentResponse(BoxDocumentBase):
     class Config:
         from_attributes = True
 
-class BoxFolderBase(BaseModel):
+class BoxFolderBase(BaseSchema):
     folder_name: str
     folder_type: Optional[str] = "regulatory_documents"
     description: Optional[str] = None
@@ -252,13 +316,13 @@ class BoxFolderCreate(BoxFolderBase):
     parent_folder_id: Optional[str] = None
     company_profile_id: Optional[int] = None
 
-class BoxFolderUpdate(BaseModel):
+class BoxFolderUpdate(BaseSchema):
     folder_name: Optional[str] = None
     folder_type: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
 
-class BoxFolderResponse(BoxFolderBase):
+class BoxFolderResponse(BoxFolderBase, ORMResponse):
     id: int
     box_folder_id: str
     parent_folder_id: Optional[str] = None
@@ -270,7 +334,7 @@ class BoxFolderResponse(BoxFolderBase):
     class Config:
         from_attributes = True
 
-class BoxUploadResponse(BaseModel):
+class BoxUploadResponse(ORMResponse):
     id: int
     box_file_id: str
     filename: str
@@ -1,49 +1,121 @@
 """
 Box API Service for document storage and management
 """
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any, BinaryIO
-from boxsdk import OAuth2, Client
+import time
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, AsyncIterator, BinaryIO, Tuple
+import httpx
+from boxsdk import OAuth2, JWTAuth, Client
 from boxsdk.exception import BoxAPIException
+from boxsdk.network.default_network import DefaultNetwork
+from boxsdk.session.session import AuthorizedSession
+from requests.adapters import HTTPAdapter
 from ..config import (
     BOX_CLIENT_ID, 
     BOX_CLIENT_SECRET, 
     BOX_ACCESS_TOKEN, 
     BOX_REFRESH_TOKEN,
     BOX_ENTERPRISE_ID,
-    BOX_FOLDER_ID
+    BOX_FOLDER_ID,
+    BOX_JWT_CONFIG_FILE,
+    BOX_STARTUP_PROBE
 )
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections to api.box.com shared by concurrent calls
+BOX_POOL_SIZE = 32
+
+# Bytes read per chunk when streaming a download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Fields requested for folder listings; Box otherwise returns mini items
+# without size or timestamps
+FOLDER_ITEM_FIELDS = ["id", "name", "type", "size", "created_at", "modified_at"]
+_folder_item_values = attrgetter("id", "name", "type", "created_at", "modified_at")
+
+# Seconds Box file and folder metadata is served from the local cache
+METADATA_CACHE_TTL = 60
+
+class TTLCache:
+    """Small in-process cache whose entries expire after a fixed time"""
+    
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+    
+    def set(self, key: Any, value: Any):
+        """Cache a value, evicting the oldest entry when full"""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def invalidate(self, key: Any):
+        """Drop a cached value"""
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every cached value"""
+        self._entries.clear()
+
+class PooledNetwork(DefaultNetwork):
+    """boxsdk network layer with a larger keep-alive connection pool"""
+    
+    def __init__(self, pool_size: int = BOX_POOL_SIZE):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+
 class BoxService:
     """Service for interacting with Box API"""
     
     def __init__(self):
         self.client = None
+        # Box metadata rarely changes within a run; cache it briefly
+        self._file_info_cache = TTLCache(METADATA_CACHE_TTL)
+        self._folder_contents_cache = TTLCache(METADATA_CACHE_TTL)
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initialize Box client with OAuth2 authentication"""
+        """Initialize Box client with JWT or OAuth2 authentication"""
         try:
-            if not all([BOX_CLIENT_ID, BOX_CLIENT_SECRET]):
+            if BOX_JWT_CONFIG_FILE:
+                auth = JWTAuth.from_settings_file(BOX_JWT_CONFIG_FILE)
+            elif all([BOX_CLIENT_ID, BOX_CLIENT_SECRET]):
+                auth = OAuth2(
+                    client_id=BOX_CLIENT_ID,
+                    client_secret=BOX_CLIENT_SECRET,
+                    access_token=BOX_ACCESS_TOKEN,
+                    refresh_token=BOX_REFRESH_TOKEN
+                )
+            else:
                 logger.warning("Box API credentials not configured. Box integration disabled.")
                 return
             
-            # Initialize OAuth2
-            oauth = OAuth2(
-                client_id=BOX_CLIENT_ID,
-                client_secret=BOX_CLIENT_SECRET,
-                access_token=BOX_ACCESS_TOKEN,
-                refresh_token=BOX_REFRESH_TOKEN
-            )
-            
-            # Initialize client
-            self.client = Client(oauth)
+            # Initialize client; every call goes through one pooled
+            # requests.Session so TLS connections are reused
+            self.client = Client(auth, session=AuthorizedSession(auth, network_layer=PooledNetwork()))
             
-            # Test connection
-            user = self.client.user().get()
-            logger.info(f"Box API connected successfully. User: {user.name}")
+            # Test connection; optional since it costs a Box round trip
+            if BOX_STARTUP_PROBE:
+                user = self.client.user().get()
+                logger.info(f"Box API connected successfully. User: {user.name}")
             
         except Exception as e:
             logger.error(f"Failed to initialize Box client: {e}")
@@ -61,8 +133,11 @@ class BoxService:
         
         try:
             parent_id = parent_folder_id or BOX_FOLDER_ID
-            folder = self.client.folder(parent_id).create_subfolder(name)
+            # boxsdk is blocking; run it off the event loop so concurrent
+            # creates overlap instead of serializing
+            folder = await asyncio.to_thread(self.client.folder(parent_id).create_subfolder, name)
             
+            self._folder_contents_cache.invalidate(parent_id)
             logger.info(f"Created Box folder: {name} (ID: {folder.id})")
             return {
                 "id": folder.id,
@@ -90,63 +165,92 @@ class BoxService:
         
         try:
             parent_id = folder_id or BOX_FOLDER_ID
-            uploaded_file = self.client.folder(parent_id).upload_stream(
-                file_content, 
-                filename,
-                file_description=description
+            info = await asyncio.to_thread(
+                self._upload_file_sync, file_content, filename, parent_id, description
             )
             
-            logger.info(f"Uploaded file to Box: {filename} (ID: {uploaded_file.id})")
-            return {
-                "id": uploaded_file.id,
-                "name": uploaded_file.name,
-                "type": uploaded_file.type,
-                "size": uploaded_file.size,
-                "created_at": uploaded_file.created_at,
-                "modified_at": uploaded_file.modified_at,
-                "download_url": uploaded_file.get_download_url(),
-                "shared_link": uploaded_file.get_shared_link()
-            }
+            self._folder_contents_cache.invalidate(parent_id)
+            logger.info(f"Uploaded file to Box: {filename} (ID: {info['id']})")
+            return info
         except BoxAPIException as e:
             logger.error(f"Failed to upload file {filename} to Box: {e}")
             return None
     
-    async def download_file(self, file_id: str) -> Optional[bytes]:
-        """Download a file from Box"""
+    def _upload_file_sync(
+        self,
+        file_content: BinaryIO,
+        filename: str,
+        parent_id: str,
+        description: Optional[str]
+    ) -> Dict[str, Any]:
+        """Upload a file and fetch its links; blocking, run via to_thread"""
+        uploaded_file = self.client.folder(parent_id).upload_stream(
+            file_content, 
+            filename,
+            file_description=description
+        )
+        return self._file_info_dict(uploaded_file)
+    
+    @staticmethod
+    def _file_info_dict(box_file) -> Dict[str, Any]:
+        """File metadata plus its download and shared links; blocking"""
+        return {
+            "id": box_file.id,
+            "name": box_file.name,
+            "type": box_file.type,
+            "size": box_file.size,
+            "created_at": box_file.created_at,
+            "modified_at": box_file.modified_at,
+            "download_url": box_file.get_download_url(),
+            "shared_link": box_file.get_shared_link()
+        }
+    
+    async def download_file(self, file_id: str) -> Optional[AsyncIterator[bytes]]:
+        """Stream a file from Box in chunks"""
         if not self.client:
             logger.error("Box client not initialized")
             return None
         
         try:
-            file_content = self.client.file(file_id).content()
-            logger.info(f"Downloaded file from Box: {file_id}")
-            return file_content
+            # Resolve the download URL up front so Box errors surface before
+            # the caller starts sending a response
+            download_url = await asyncio.to_thread(self.client.file(file_id).get_download_url)
+            logger.info(f"Streaming file from Box: {file_id}")
+            return self._stream_download(download_url)
         except BoxAPIException as e:
             logger.error(f"Failed to download file {file_id} from Box: {e}")
             return None
     
+    async def _stream_download(self, download_url: str) -> AsyncIterator[bytes]:
+        """Yield the body of a Box download URL without buffering it whole"""
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            async with client.stream("GET", download_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+    
     async def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get file information from Box"""
         if not self.client:
             logger.error("Box client not initialized")
             return None
         
+        cached = self._file_info_cache.get(file_id)
+        if cached is not None:
+            return cached
+        
         try:
-            file_info = self.client.file(file_id).get()
-            return {
-                "id": file_info.id,
-                "name": file_info.name,
-                "type": file_info.type,
-                "size": file_info.size,
-                "created_at": file_info.created_at,
-                "modified_at": file_info.modified_at,
-                "download_url": file_info.get_download_url(),
-                "shared_link": file_info.get_shared_link()
-            }
+            info = await asyncio.to_thread(self._get_file_info_sync, file_id)
+            self._file_info_cache.set(file_id, info)
+            return info
         except BoxAPIException as e:
             logger.error(f"Failed to get file info {file_id} from Box: {e}")
             return None
     
+    def _get_file_info_sync(self, file_id: str) -> Dict[str, Any]:
+        """Fetch file metadata and links; blocking, three Box round trips"""
+        return self._file_info_dict(self.client.file(file_id).get())
+    
     async def delete_file(self, file_id: str) -> bool:
         """Delete a file from Box"""
         if not self.client:
@@ -154,7 +258,10 @@ class BoxService:
             return False
         
         try:
-            self.client.file(file_id).delete()
+            await asyncio.to_thread(self.client.file(file_id).delete)
+            self._file_info_cache.invalidate(file_id)
+            # The parent folder is not known here, so drop all listings
+            self._folder_contents_cache.clear()
             logger.info(f"Deleted file from Box: {file_id}")
             return True
         except BoxAPIException as e:
@@ -174,11 +281,13 @@ class BoxService:
             return None
         
         try:
-            shared_link = self.client.file(file_id).create_shared_link(
+            shared_link = await asyncio.to_thread(
+                self.client.file(file_id).create_shared_link,
                 access=access,
                 password=password,
                 unshared_at=expires_at
             )
+            self._file_info_cache.invalidate(file_id)
             logger.info(f"Created shared link for file: {file_id}")
             return shared_link.url
         except BoxAPIException as e:
@@ -191,27 +300,37 @@ class BoxService:
             logger.error("Box client not initialized")
             return []
         
+        parent_id = folder_id or BOX_FOLDER_ID
+        cached = self._folder_contents_cache.get(parent_id)
+        if cached is not None:
+            return cached
+        
         try:
-            parent_id = folder_id or BOX_FOLDER_ID
-            items = self.client.folder(parent_id).get_items()
-            
-            contents = []
-            for item in items:
-                contents.append({
-                    "id": item.id,
-                    "name": item.name,
-                    "type": item.type,
-                    "size": getattr(item, 'size', 0),
-                    "created_at": item.created_at,
-                    "modified_at": item.modified_at
-                })
+            contents = await asyncio.to_thread(self._list_folder_contents_sync, parent_id)
             
+            self._folder_contents_cache.set(parent_id, contents)
             logger.info(f"Listed {len(contents)} items from Box folder: {parent_id}")
             return contents
         except BoxAPIException as e:
             logger.error(f"Failed to list folder contents {folder_id}: {e}")
             return []
     
+    def _list_folder_contents_sync(self, parent_id: str) -> List[Dict[str, Any]]:
+        """List a folder; blocking, since each page of items is a Box request"""
+        contents = []
+        for item in self.client.folder(parent_id).get_items(fields=FOLDER_ITEM_FIELDS):
+            item_id, name, item_type, created_at, modified_at = _folder_item_values(item)
+            contents.append({
+                "id": item_id,
+                "name": name,
+                "type": item_type,
+                # Web links carry no size even when it is requested
+                "size": getattr(item, 'size', 0),
+                "created_at": created_at,
+                "modified_at": modified_at
+            })
+        return contents
+    
     async def search_files(self, query: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Search for files in Box"""
         if not self.client:
@@ -219,24 +338,7 @@ class BoxService:
             return []
         
         try:
-            results = self.client.search().query(
-                query=query,
-                limit=limit,
-                offset=0
-            )
-            
-            files = []
-            for item in results:
-                if item.type == 'file':
-                    files.append({
-                        "id": item.id,
-                        "name": item.name,
-                        "type": item.type,
-                        "size": item.size,
-                        "created_at": item.created_at,
-                        "modified_at": item.modified_at,
-                        "path": getattr(item, 'path_collection', {}).get('entries', [])
-                    })
+            files = await asyncio.to_thread(self._search_files_sync, query, limit)
             
             logger.info(f"Found {len(files)} files matching query: {query}")
             return files
@@ -244,6 +346,28 @@ class BoxService:
             logger.error(f"Failed to search files with query {query}: {e}")
             return []
     
+    def _search_files_sync(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Run a file search; blocking, since each page of results is a Box request"""
+        results = self.client.search().query(
+            query=query,
+            limit=limit,
+            offset=0
+        )
+        
+        files = []
+        for item in results:
+            if item.type == 'file':
+                files.append({
+                    "id": item.id,
+                    "name": item.name,
+                    "type": item.type,
+                    "size": item.size,
+                    "created_at": item.created_at,
+                    "modified_at": item.modified_at,
+                    "path": getattr(item, 'path_collection', {}).get('entries', [])
+                })
+        return files
+    
     async def create_regulatory_documents_folder(self, company_name: str) -> Optional[str]:
         """Create a dedicated folder for regulatory documents"""
         if not self.client:
@@ -264,8 +388,10 @@ class BoxService:
                     "Audit Reports"
                 ]
                 
-                for subfolder_name in subfolders:
-                    await self.create_folder(subfolder_name, folder["id"])
+                await asyncio.gather(*(
+                    self.create_folder(subfolder_name, folder["id"])
+                    for subfolder_name in subfolders
+                ))
                 
                 logger.info(f"Created regulatory documents folder structure for: {company_name}")
                 return folder["id"]
@@ -275,5 +401,7 @@ class BoxService:
             logger.error(f"Failed to create regulatory documents folder for {company_name}: {e}")
             return None
 
-# Global instance
-box_service = BoxService()
+@lru_cache(maxsize=1)
+def get_box_service() -> BoxService:
+    """Return the shared BoxService, creating it on first use"""
+    return BoxService()
@@ -2,25 +2,90 @@
 Socket.io server for real-time updates
 """
 
+import asyncio
+import contextlib
 import socketio
+import orjson
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from fastapi import FastAPI
-from src.config import SOCKET_IO_CORS_ALLOWED_ORIGINS
+from src.config import SOCKET_IO_CORS_ALLOWED_ORIGINS, SIO_DEBUG
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonPacking:
+    """json-module stand-in so Socket.io packets are encoded with orjson"""
+    
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        """Encode a packet payload; orjson output is already compact"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(data, **kwargs):
+        """Decode a packet payload"""
+        return orjson.loads(data)
+
 # Create Socket.io server
 sio = socketio.AsyncServer(
     cors_allowed_origins=SOCKET_IO_CORS_ALLOWED_ORIGINS,
-    logger=True,
-    engineio_logger=True
+    logger=SIO_DEBUG,
+    engineio_logger=SIO_DEBUG,
+    json=OrjsonPacking
 )
 
 # Create Socket.io app
 socket_app = socketio.ASGIApp(sio)
 
+@lru_cache(maxsize=4096)
+def _room(report_id: int) -> str:
+    """Room name for an analysis, built once per report"""
+    return f"analysis_{report_id}"
+
+def _client_report_id(data: Any) -> Optional[int]:
+    """Report id from a client payload as a positive int, or None if invalid"""
+    report_id = data.get('report_id') if isinstance(data, dict) else None
+    if isinstance(report_id, str) and report_id.isdecimal():
+        report_id = int(report_id)
+    if isinstance(report_id, int) and not isinstance(report_id, bool) and report_id > 0:
+        return report_id
+    return None
+
+async def _emit(report_id: int, event: str, data: dict):
+    """Emit an event to all clients in the analysis room"""
+    await sio.emit(event, data, room=_room(report_id))
+
+# Progress bursts are coalesced: at most one emit per interval per report,
+# always carrying the latest payload
+PROGRESS_FLUSH_INTERVAL = 0.05
+_pending_progress: Dict[int, dict] = {}
+_progress_flushers: Dict[int, asyncio.Task] = {}
+
+async def _flush_progress(report_id: int):
+    """Send the latest pending progress for a report until none is left"""
+    try:
+        while report_id in _pending_progress:
+            await _emit(report_id, 'analysis_progress', _pending_progress.pop(report_id))
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+    finally:
+        if _progress_flushers.get(report_id) is asyncio.current_task():
+            del _progress_flushers[report_id]
+
+async def _finish_progress(report_id: int):
+    """Stop coalescing for a report, sending any progress still pending"""
+    flusher = _progress_flushers.pop(report_id, None)
+    if flusher is not None:
+        flusher.cancel()
+        # Wait for the flusher to stop so none of its frames can follow ours
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+    pending = _pending_progress.pop(report_id, None)
+    if pending is not None:
+        await _emit(report_id, 'analysis_progress', pending)
+
 @sio.event
 async def connect(sid, environ, auth):
     """Handle client connection"""
@@ -35,9 +100,11 @@ async def disconnect(sid):
 @sio.event
 async def join_analysis_room(sid, data):
     """Join a specific analysis room for real-time updates"""
-    report_id = data.get('report_id')
-    if report_id:
-        room = f"analysis_{report_id}"
+    report_id = _client_report_id(data)
+    if report_id is None:
+        logger.warning(f"Client {sid} sent an invalid report id to join")
+    else:
+        room = _room(report_id)
         sio.enter_room(sid, room)
         logger.info(f"Client {sid} joined analysis room {room}")
         await sio.emit('joined_room', {'room': room}, room=sid)
@@ -45,28 +112,33 @@ async def join_analysis_room(sid, data):
 @sio.event
 async def leave_analysis_room(sid, data):
     """Leave a specific analysis room"""
-    report_id = data.get('report_id')
-    if report_id:
-        room = f"analysis_{report_id}"
+    report_id = _client_report_id(data)
+    if report_id is None:
+        logger.warning(f"Client {sid} sent an invalid report id to leave")
+    else:
+        room = _room(report_id)
         sio.leave_room(sid, room)
         logger.info(f"Client {sid} left analysis room {room}")
 
 async def emit_analysis_progress(report_id: int, progress_data: dict):
     """Emit analysis progress to all clients in the analysis room"""
-    room = f"analysis_{report_id}"
-    await sio.emit('analysis_progress', progress_data, room=room)
-    logger.info(f"Emitted progress for report {report_id}: {progress_data}")
+    _pending_progress[report_id] = progress_data
+    if report_id not in _progress_flushers:
+        _progress_flushers[report_id] = asyncio.create_task(_flush_progress(report_id))
+    # Progress fires on every stage; only format the payload when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Queued progress for report {report_id}: {progress_data}")
 
 async def emit_analysis_complete(report_id: int, result_data: dict):
     """Emit analysis completion to all clients in the analysis room"""
-    room = f"analysis_{report_id}"
-    await sio.emit('analysis_complete', result_data, room=room)
+    await _finish_progress(report_id)
+    await _emit(report_id, 'analysis_complete', result_data)
     logger.info(f"Emitted completion for report {report_id}")
 
 async def emit_analysis_error(report_id: int, error_data: dict):
     """Emit analysis error to all clients in the analysis room"""
-    room = f"analysis_{report_id}"
-    await sio.emit('analysis_error', error_data, room=room)
+    await _finish_progress(report_id)
+    await _emit(report_id, 'analysis_error', error_data)
     logger.error(f"Emitted error for report {report_id}: {error_data}")
 
 # Export the socket instance for use in other modules
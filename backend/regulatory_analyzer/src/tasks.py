@@ -3,17 +3,45 @@ Background tasks for the Regulatory Intelligence Platform
 """
 
 from celery import current_task
+from celery.signals import worker_process_init
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import case, insert, select
+from sqlalchemy.orm import Session, load_only
+import asyncio
 import logging
 
 from .celery_app import celery_app
 from .database.session import SessionLocal
-from .database.models import Report, Schedule
+from .database.models import Report, Schedule, RegulatoryChange, BoxDocument, Frequency
 from .core.pipeline.orchestrator import AnalysisOrchestrator
 
 logger = logging.getLogger(__name__)
 
+# How far each schedule frequency pushes next_run
+_FREQUENCY_INTERVALS = {
+    Frequency.daily: timedelta(days=1),
+    Frequency.weekly: timedelta(weeks=1),
+    Frequency.monthly: timedelta(days=30),
+    Frequency.quarterly: timedelta(days=90),
+}
+
+# Event loop owned by this worker process and reused by every task
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+@worker_process_init.connect
+def init_worker_loop(**kwargs):
+    """Create the event loop once per worker process"""
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return the worker's event loop, creating it if no prefork init ran"""
+    if _loop is None or _loop.is_closed():
+        init_worker_loop()
+    return _loop
+
 @celery_app.task(bind=True)
 def run_analysis_task(self, report_id: int, company_profile_id: int, analysis_type: str = "comprehensive"):
     """Run analysis in background task"""
@@ -25,20 +53,13 @@ def run_analysis_task(self, report_id: int, company_profile_id: int, analysis_ty
         orchestrator = AnalysisOrchestrator()
         
         # Run the analysis (this will emit Socket.io events)
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            loop.run_until_complete(
-                orchestrator.run_analysis(
-                    report_id=report_id,
-                    company_profile_id=company_profile_id,
-                    analysis_type=analysis_type
-                )
+        get_worker_loop().run_until_complete(
+            orchestrator.run_analysis(
+                report_id=report_id,
+                company_profile_id=company_profile_id,
+                analysis_type=analysis_type
             )
-        finally:
-            loop.close()
+        )
         
         return {"status": "completed", "report_id": report_id}
         
@@ -56,21 +77,29 @@ def cleanup_old_reports():
     try:
         db = SessionLocal()
         
-        # Delete reports older than 90 days
+        # Delete reports older than 90 days, one statement per table
+        # instead of loading and deleting each row through the session
         cutoff_date = datetime.utcnow() - timedelta(days=90)
-        old_reports = db.query(Report).filter(
+        old_report_ids = select(Report.id).where(
             Report.created_at < cutoff_date,
             Report.status.in_(["completed", "failed"])
-        ).all()
+        )
         
-        for report in old_reports:
-            db.delete(report)
+        db.query(RegulatoryChange).filter(
+            RegulatoryChange.report_id.in_(old_report_ids)
+        ).delete(synchronize_session=False)
+        db.query(BoxDocument).filter(
+            BoxDocument.report_id.in_(old_report_ids)
+        ).update({BoxDocument.report_id: None}, synchronize_session=False)
+        cleaned = db.query(Report).filter(
+            Report.id.in_(old_report_ids)
+        ).delete(synchronize_session=False)
         
         db.commit()
         db.close()
         
-        logger.info(f"Cleaned up {len(old_reports)} old reports")
-        return {"cleaned_reports": len(old_reports)}
+        logger.info(f"Cleaned up {cleaned} old reports")
+        return {"cleaned_reports": cleaned}
         
     except Exception as e:
         logger.error(f"Cleanup task failed: {e}")
@@ -82,58 +111,69 @@ def process_scheduled_analyses():
     try:
         db = SessionLocal()
         
-        # Find schedules that are due to run
+        # Find schedules that are due to run, streaming them in batches
+        # and loading only the columns used to create their reports
         now = datetime.utcnow()
-        due_schedules = db.query(Schedule).filter(
+        due_schedules = db.query(Schedule).options(
+            load_only(
+                Schedule.id, Schedule.name, Schedule.analysis_type,
+                Schedule.user_id, Schedule.company_profile_id
+            )
+        ).filter(
             Schedule.is_active == True,
             Schedule.next_run <= now
-        ).all()
+        ).yield_per(100)
         
-        processed = 0
+        # Collect one report row per due schedule while streaming
+        processed_ids = []
+        report_rows = []
         for schedule in due_schedules:
-            try:
-                # Create a new report for the scheduled analysis
-                report = Report(
-                    title=f"Scheduled Analysis - {schedule.name}",
-                    analysis_type=schedule.analysis_type,
-                    scope=f"Automated analysis for {schedule.name}",
-                    status="pending",
-                    user_id=schedule.user_id,
-                    company_profile_id=schedule.company_profile_id
-                )
-                
-                db.add(report)
-                db.commit()
-                db.refresh(report)
-                
-                # Start the analysis task
-                run_analysis_task.delay(
-                    report_id=report.id,
-                    company_profile_id=schedule.company_profile_id,
-                    analysis_type=schedule.analysis_type
-                )
-                
-                # Update next run time
-                if schedule.frequency == "daily":
-                    schedule.next_run = now + timedelta(days=1)
-                elif schedule.frequency == "weekly":
-                    schedule.next_run = now + timedelta(weeks=1)
-                elif schedule.frequency == "monthly":
-                    schedule.next_run = now + timedelta(days=30)
-                elif schedule.frequency == "quarterly":
-                    schedule.next_run = now + timedelta(days=90)
-                
-                schedule.last_run = now
-                processed += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to process schedule {schedule.id}: {e}")
+            processed_ids.append(schedule.id)
+            report_rows.append({
+                "title": f"Scheduled Analysis - {schedule.name}",
+                "analysis_type": schedule.analysis_type,
+                "scope": f"Automated analysis for {schedule.name}",
+                "status": "pending",
+                "user_id": schedule.user_id,
+                "company_profile_id": schedule.company_profile_id
+            })
+        
+        # Insert every report in one INSERT ... RETURNING, ids coming back
+        # in row order so they pair up with report_rows
+        report_ids = []
+        if report_rows:
+            report_ids = db.execute(
+                insert(Report).returning(Report.id, sort_by_parameter_order=True),
+                report_rows
+            ).scalars().all()
         
+        # Advance every dispatched schedule in one UPDATE, picking the
+        # interval per row with a CASE on its frequency
+        if processed_ids:
+            db.query(Schedule).filter(Schedule.id.in_(processed_ids)).update(
+                {
+                    Schedule.last_run: now,
+                    Schedule.next_run: case(
+                        {frequency: now + interval for frequency, interval in _FREQUENCY_INTERVALS.items()},
+                        value=Schedule.frequency,
+                        else_=Schedule.next_run
+                    )
+                },
+                synchronize_session=False
+            )
         db.commit()
         db.close()
         
-        logger.info(f"Processed {processed} scheduled analyses")
-        return {"processed_schedules": processed}
+        # Start the analysis tasks once their reports are committed
+        for report_id, row in zip(report_ids, report_rows):
+            run_analysis_task.delay(
+                report_id=report_id,
+                company_profile_id=row["company_profile_id"],
+                analysis_type=row["analysis_type"]
+            )
+        
+        logger.info(f"Processed {len(processed_ids)} scheduled analyses")
+        return {"processed_schedules": len(processed_ids)}
         
     except Exception as e:
         logger.error(f"Scheduled analysis task failed: {e}")
@@ -2,28 +2,51 @@
 Minimal FastAPI Application for testing
 """
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 import uvicorn
+import orjson
+import msgspec
+import enum
+import hashlib
+import itertools
 import logging
+import os
+import sys
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; MOCK_DEBUG=true restores info-level and access logs
+DEBUG_LOGGING = os.getenv("MOCK_DEBUG", "False").lower() == "true"
+logging.basicConfig(level=logging.INFO if DEBUG_LOGGING else logging.WARNING)
 logger = logging.getLogger(__name__)
 
-# Pydantic models
-class LoginRequest(BaseModel):
+# Request/response bodies, decoded and encoded with msgspec
+class LoginRequest(msgspec.Struct):
     username: str
     password: str
 
-class LoginResponse(BaseModel):
+class LoginResponse(msgspec.Struct):
     access_token: str
     token_type: str
     user: dict
 
+def msgspec_body(struct_type: type) -> Callable:
+    """Build a dependency that decodes the request body into a msgspec Struct"""
+    async def decode(request: Request):
+        try:
+            return msgspec.json.decode(await request.body(), type=struct_type, strict=False)
+        except msgspec.ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except msgspec.DecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+    return decode
+
+# Pydantic models
+
 class User(BaseModel):
     id: int
     username: str
@@ -41,15 +64,76 @@ MOCK_USERS = {
     }
 }
 
-# Mock reports storage
-MOCK_REPORTS = []
+# Public user fields never change, so each user's response dict is built once
+USER_PUBLIC = {
+    email: {
+        "id": user["id"],
+        "username": user["username"],
+        "email": user["email"],
+        "is_active": user["is_active"]
+    }
+    for email, user in MOCK_USERS.items()
+}
+USER_PUBLIC_BY_ID = {user["id"]: user for user in USER_PUBLIC.values()}
+
+# Mock tokens are deterministic, so every user's token is indexed up front
+# and stays valid across restarts
+TOKEN_INDEX: dict[str, dict] = {
+    f"mock_token_{user['id']}_{user['username']}": user for user in MOCK_USERS.values()
+}
+
+# Mock reports storage, keyed by report id
+MOCK_REPORTS: dict[int, dict] = {}
+
+# Sequential report ids, so a new report can never overwrite an old one
+_REPORT_SEQ = itertools.count(1000)
+
+# Serialized single reports: id -> (updated_at, JSON bytes)
+_REPORT_JSON_CACHE: dict[int, tuple[str, bytes]] = {}
+
+# Bumped on every report write in this process; only used to tell when the
+# cached reports list body is stale
+_REPORTS_VERSION = 0
+_REPORTS_LIST_CACHE: Optional[Tuple[int, bytes, str]] = None
+
+def _etag(body: bytes) -> str:
+    """Weak ETag derived from the body, so it agrees across worker processes"""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def _reports_list() -> Tuple[bytes, str]:
+    """Serialized reports list, newest first, and its ETag"""
+    global _REPORTS_LIST_CACHE
+    if _REPORTS_LIST_CACHE is None or _REPORTS_LIST_CACHE[0] != _REPORTS_VERSION:
+        # Reports are inserted in creation order, so newest first is just
+        # the dict reversed
+        body = orjson.dumps(list(reversed(MOCK_REPORTS.values())))
+        _REPORTS_LIST_CACHE = (_REPORTS_VERSION, body, _etag(body))
+    return _REPORTS_LIST_CACHE[1], _REPORTS_LIST_CACHE[2]
+
+# Company profiles are always empty, so their body and ETag never change
+COMPANY_PROFILES_BODY = b"[]"
+COMPANY_PROFILES_ETAG = _etag(COMPANY_PROFILES_BODY)
+
+def _json_or_not_modified(request: Request, body: bytes, etag: str) -> Response:
+    """Answer a conditional GET with 304, otherwise with the JSON body"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 security = HTTPBearer()
 
+async def require_auth(token = Depends(security)) -> dict:
+    """Resolve the bearer token to its mock user"""
+    user = TOKEN_INDEX.get(token.credentials)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user
+
 app = FastAPI(
     title="Regulatory Intelligence Platform",
     description="AI-powered regulatory change monitoring and analysis platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -61,17 +145,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Bodies of the static endpoints, serialized once; a fresh Response is
+# still built per request since middleware edits response headers in place
+ROOT_BODY = orjson.dumps({"message": "Regulatory Intelligence Platform API"})
+HEALTH_BODY = orjson.dumps({"status": "healthy", "message": "API is running"})
+
 @app.get("/")
 async def root():
-    return {"message": "Regulatory Intelligence Platform API"}
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "API is running"}
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 # Authentication endpoints
-@app.post("/api/auth/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest):
+@app.post("/api/auth/login")
+async def login(login_data: LoginRequest = Depends(msgspec_body(LoginRequest))):
     """Mock login endpoint"""
     user_email = login_data.username
     password = login_data.password
@@ -81,38 +170,19 @@ async def login(login_data: LoginRequest):
         # Generate a simple mock token
         access_token = f"mock_token_{user['id']}_{user['username']}"
         
-        return LoginResponse(
+        response = LoginResponse(
             access_token=access_token,
             token_type="bearer",
-            user={
-                "id": user["id"],
-                "username": user["username"],
-                "email": user["email"],
-                "is_active": user["is_active"]
-            }
+            user=USER_PUBLIC[user_email]
         )
+        return Response(content=msgspec.json.encode(response), media_type="application/json")
     else:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
 @app.get("/api/auth/me")
-async def get_current_user(token: str = Depends(security)):
+async def get_current_user(user: dict = Depends(require_auth)):
     """Get current user info"""
-    # Simple token validation for mock
-    if token.credentials.startswith("mock_token_"):
-        parts = token.credentials.split("_")
-        if len(parts) >= 3:
-            user_id = int(parts[2])
-            # Find user by ID
-            for user in MOCK_USERS.values():
-                if user["id"] == user_id:
-                    return {
-                        "id": user["id"],
-                        "username": user["username"],
-                        "email": user["email"],
-                        "is_active": user["is_active"]
-                    }
-    
-    raise HTTPException(status_code=401, detail="Invalid token")
+    return USER_PUBLIC_BY_ID[user["id"]]
 
 @app.post("/api/auth/logout")
 async def logout():
@@ -120,7 +190,7 @@ async def logout():
     return {"message": "Successfully logged out"}
 
 # Analysis endpoints
-class AnalysisRequest(BaseModel):
+class AnalysisRequest(msgspec.Struct, kw_only=True):
     title: str
     categories: str
     target_product_path: Optional[str] = None
@@ -128,21 +198,16 @@ class AnalysisRequest(BaseModel):
     end_date: str
     notification_emails: list = []
     trusted_websites: list = []
-    languages: list = ["English"]
+    languages: list = msgspec.field(default_factory=lambda: ["English"])
     target_country: str = "United States"
     guardrails: Optional[str] = None
 
 @app.post("/api/analysis/create")
-async def create_analysis(analysis: AnalysisRequest, token: str = Depends(security)):
+async def create_analysis(analysis: AnalysisRequest = Depends(msgspec_body(AnalysisRequest)), user: dict = Depends(require_auth)):
     """Mock create analysis endpoint"""
-    # Simple token validation
-    if not token.credentials.startswith("mock_token_"):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
     # Mock report ID
-    import random
-    from datetime import datetime
-    report_id = random.randint(1000, 9999)
+    report_id = next(_REPORT_SEQ)
+    now = datetime.now().isoformat()
     
     # Create a report object
     report = {
@@ -152,8 +217,8 @@ async def create_analysis(analysis: AnalysisRequest, token: str = Depends(securi
         "categories": analysis.categories,
         "start_date": analysis.start_date,
         "end_date": analysis.end_date,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": now,
+        "updated_at": now,
         "user_id": 1,
         "analysis_results": None,
         "notification_emails": analysis.notification_emails,
@@ -164,7 +229,9 @@ async def create_analysis(analysis: AnalysisRequest, token: str = Depends(securi
     }
     
     # Add to mock storage
-    MOCK_REPORTS.append(report)
+    global _REPORTS_VERSION
+    MOCK_REPORTS[report_id] = report
+    _REPORTS_VERSION += 1
     
     return {
         "report_id": report_id,
@@ -178,57 +245,68 @@ async def create_analysis(analysis: AnalysisRequest, token: str = Depends(securi
 
 # Reports endpoints
 @app.get("/api/reports")
-async def get_reports(token: str = Depends(security)):
+async def get_reports(request: Request, user: dict = Depends(require_auth)):
     """Mock get reports endpoint"""
-    if not token.credentials.startswith("mock_token_"):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    # Return all reports sorted by created_at (newest first)
-    sorted_reports = sorted(MOCK_REPORTS, key=lambda x: x['created_at'], reverse=True)
-    return sorted_reports
+    return _json_or_not_modified(request, *_reports_list())
 
 @app.get("/api/reports/{report_id}")
-async def get_report(report_id: int, token: str = Depends(security)):
+async def get_report(report_id: int, user: dict = Depends(require_auth)):
     """Mock get single report endpoint"""
-    if not token.credentials.startswith("mock_token_"):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    # Find report by ID
-    for report in MOCK_REPORTS:
-        if report['id'] == report_id:
-            return report
-    
-    raise HTTPException(status_code=404, detail="Report not found")
+    report = MOCK_REPORTS.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    cached = _REPORT_JSON_CACHE.get(report_id)
+    if cached is None or cached[0] != report["updated_at"]:
+        cached = (report["updated_at"], orjson.dumps(report))
+        _REPORT_JSON_CACHE[report_id] = cached
+    return Response(content=cached[1], media_type="application/json")
+
+# Same values as ReportStatus in src/database/models.py
+class ReportStatus(enum.StrEnum):
+    pending = "pending"
+    in_progress = "in_progress"
+    completed = "completed"
+    failed = "failed"
+
+class StatusUpdate(BaseModel):
+    status: ReportStatus
 
 @app.put("/api/reports/{report_id}/status")
-async def update_report_status(report_id: int, status: str, token: str = Depends(security)):
+async def update_report_status(report_id: int, body: StatusUpdate, user: dict = Depends(require_auth)):
     """Mock update report status endpoint"""
-    if not token.credentials.startswith("mock_token_"):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    from datetime import datetime
-    # Find and update report
-    for report in MOCK_REPORTS:
-        if report['id'] == report_id:
-            report['status'] = status
-            report['updated_at'] = datetime.now().isoformat()
-            return {"message": "Status updated successfully", "report": report}
+    report = MOCK_REPORTS.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
     
-    raise HTTPException(status_code=404, detail="Report not found")
+    global _REPORTS_VERSION
+    report.update(status=body.status.value, updated_at=datetime.now().isoformat())
+    _REPORTS_VERSION += 1
+    _REPORT_JSON_CACHE.pop(report_id, None)
+    return {"message": "Status updated successfully", "report": report}
 
 # Management endpoints  
 @app.get("/api/management/company-profiles")
-async def get_company_profiles(token: str = Depends(security)):
+async def get_company_profiles(request: Request, user: dict = Depends(require_auth)):
     """Mock get company profiles endpoint"""
-    if not token.credentials.startswith("mock_token_"):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    return []
+    return _json_or_not_modified(request, COMPANY_PROFILES_BODY, COMPANY_PROFILES_ETAG)
 
 if __name__ == "__main__":
+    # Extra worker processes use more cores, but each keeps its own
+    # MOCK_REPORTS, so a report is only visible to the worker that made it.
+    # On Linux the same can be run as:
+    #   gunicorn test_main:app -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:8000
+    workers = int(os.getenv("MOCK_WORKERS", "1"))
     uvicorn.run(
         "test_main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # Named explicitly so a missing uvloop/httptools fails loudly; uvloop
+        # has no Windows build, where the stdlib loop is used instead
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=workers,
+        access_log=DEBUG_LOGGING,
+        log_level="info" if DEBUG_LOGGING else "warning",
+        # Reload only works with a single process
+        reload=workers == 1
     )